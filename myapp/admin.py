@@ -1,19 +1,19 @@
 from django.contrib import admin
 from django.utils.safestring import mark_safe
-from .models import Vehicle, UserProfile, Booking
+from .models import Vehicle, UserProfile, Booking, ArchivedBooking, Review, Feature
 
 @admin.register(Vehicle)
 class VehicleAdmin(admin.ModelAdmin):
-    list_display = ('name', 'brand', 'model', 'vehicle_type', 'price_per_day', 'price_per_hour', 'is_available', 'image_preview', 'created_at')
+    list_display = ('name', 'brand', 'model', 'vehicle_type', 'price_per_day', 'price_per_hour', 'is_available', 'avg_rating', 'review_count', 'image_preview', 'created_at')
     list_filter = ('vehicle_type', 'brand', 'fuel_type', 'transmission', 'is_available', 'created_at')
-    search_fields = ('name', 'brand', 'model', 'description')
+    search_fields = ('name', 'brand', 'model', 'description', 'fleet_code')
     list_editable = ('is_available', 'price_per_day', 'price_per_hour')
-    readonly_fields = ('created_at', 'updated_at', 'image_preview')
+    readonly_fields = ('created_at', 'updated_at', 'image_preview', 'avg_rating', 'review_count', 'rating_sum')
     list_per_page = 25
     ordering = ('-created_at',)
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'vehicle_type', 'brand', 'model', 'year')
+            'fields': ('name', 'vehicle_type', 'brand', 'model', 'year', 'fleet_code')
         }),
         ('Specifications', {
             'fields': ('fuel_type', 'transmission', 'seats', 'mileage', 'color')
@@ -27,6 +27,10 @@ class VehicleAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('is_available',)
         }),
+        ('Ratings', {
+            'fields': ('avg_rating', 'review_count', 'rating_sum'),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -34,27 +38,30 @@ class VehicleAdmin(admin.ModelAdmin):
     )
     
     def image_preview(self, obj):
+        # Reads only the stored metadata columns, never the file itself
         if obj.image:
-            try:
-                # Validate image format
-                from PIL import Image
-                with Image.open(obj.image.path) as img:
-                    format_info = f" ({img.format}, {img.width}x{img.height})"
-                    size_info = f" ({obj.image.size / (1024*1024):.1f}MB)"
-                    format_color = "green" if img.format in ['JPEG', 'JPG', 'PNG'] else "orange"
-                    return mark_safe(
-                        f'<img src="{obj.image.url}" width="50" height="50" style="object-fit: cover; border-radius: 5px;" />'
-                        f'<br><small style="color: {format_color};">✓ Valid{format_info}{size_info}</small>'
-                    )
-            except Exception as e:
+            thumbnail = f'<img src="{obj.image.url}" width="50" height="50" style="object-fit: cover; border-radius: 5px;" />'
+            if not obj.image_format:
                 return mark_safe(
-                    f'<img src="{obj.image.url}" width="50" height="50" style="object-fit: cover; border-radius: 5px;" />'
-                    f'<br><small style="color: red;">✗ Invalid: {str(e)}</small>'
+                    f'{thumbnail}<br><small style="color: orange;">Metadata pending (run backfill_image_metadata)</small>'
                 )
+            format_info = f" ({obj.image_format}, {obj.image_width}x{obj.image_height})"
+            size_info = f" ({obj.image_bytes / (1024*1024):.1f}MB)"
+            format_color = "green" if obj.image_format in ['JPEG', 'JPG', 'PNG'] else "orange"
+            return mark_safe(
+                f'{thumbnail}<br><small style="color: {format_color};">✓ Valid{format_info}{size_info}</small>'
+            )
         return "No Image"
     image_preview.short_description = 'Image'
     image_preview.allow_tags = True
 
+@admin.register(Feature)
+class FeatureAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'bit')
+    search_fields = ('name', 'slug')
+    readonly_fields = ('bit',)
+    prepopulated_fields = {'slug': ('name',)}
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone', 'driving_license', 'id_proof', 'created_at')
@@ -94,7 +101,37 @@ class BookingAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user', 'vehicle')
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    """Read-only: rows only arrive here through manage.py archive_bookings"""
+    list_display = ('id', 'user', 'vehicle', 'start_date', 'end_date', 'total_amount', 'status', 'archived_at')
+    list_filter = ('status', 'end_date')
+    search_fields = ('user__username', 'user__email', 'vehicle__name', 'vehicle__brand')
+    list_per_page = 25
+    ordering = ('-created_at',)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'vehicle')
+    
+    def has_add_permission(self, request):
+        return False
     
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 
 
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'vehicle', 'rating', 'created_at')
+    list_filter = ('rating', 'created_at')
+    search_fields = ('user__username', 'vehicle__name', 'vehicle__brand', 'comment')
+    readonly_fields = ('created_at',)
+    list_per_page = 25
+    ordering = ('-created_at',)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'vehicle')
@@ -0,0 +1,197 @@
+"""
+Read-only JSON API (v1) for vehicles, categories and reviews.
+
+Responses are built from values() projections, never full model instances.
+Every endpoint answers conditional GETs: the ETag and Last-Modified headers
+come from cheap aggregate lookups in the database (row counts and the
+latest updated_at), so an unchanged resource gets a 304 before any payload
+query runs. They never depend on cached state, which may differ between
+worker processes or vanish.
+"""
+import hashlib
+
+from django.db.models import Count, Max, Q
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+from .forms import VehicleSearchForm
+from .models import Category, Review, Vehicle
+from .pagination import CursorPaginator, capped_count
+from .views import LISTING_COUNT_LIMIT, cursor_page_urls, filter_vehicles
+
+API_PAGE_SIZE = 24
+
+VEHICLE_FIELDS = (
+    'id', 'name', 'vehicle_type', 'brand', 'model', 'year', 'fuel_type', 'transmission', 'seats',
+    'price_per_day', 'price_per_hour', 'avg_rating', 'review_count', 'is_available', 'category_id',
+    'image', 'created_at', 'updated_at',
+)
+VEHICLE_DETAIL_FIELDS = VEHICLE_FIELDS + ('description', 'features', 'mileage', 'color', 'category__name')
+REVIEW_FIELDS = ('id', 'rating', 'comment', 'created_at', 'user__username')
+# Equal timestamps fall back to rowid order, which is what the
+# (vehicle, -created_at) index already stores
+REVIEW_ORDERING = ('-created_at', 'id')
+
+_image_storage = Vehicle._meta.get_field('image').storage
+
+
+def _etag(*parts):
+    return '"%s"' % hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _catalog_state(request):
+    """
+    (latest change, vehicle count, category count), looked up once per
+    request. The counts catch deletes, which leave no updated_at behind.
+    """
+    if not hasattr(request, '_catalog_state'):
+        vehicles = Vehicle.objects.aggregate(latest=Max('updated_at'), total=Count('pk'))
+        categories = Category.objects.aggregate(latest=Max('updated_at'), total=Count('pk'))
+        latest = max(filter(None, [vehicles['latest'], categories['latest']]), default=None)
+        request._catalog_state = (latest, vehicles['total'], categories['total'])
+    return request._catalog_state
+
+
+def _query_key(request):
+    return sorted((key, sorted(values)) for key, values in request.GET.lists())
+
+
+def _availability_window(request):
+    # Availability within a date window changes with every booking, which
+    # none of the catalog state reflects
+    return bool(request.GET.get('start') or request.GET.get('end'))
+
+
+def catalog_etag(request, **kwargs):
+    if _availability_window(request):
+        return None
+    return _etag(request.path, *_catalog_state(request), _query_key(request))
+
+
+def catalog_last_modified(request, **kwargs):
+    if _availability_window(request):
+        return None
+    return _catalog_state(request)[0]
+
+
+def _vehicle_state(request, vehicle_id):
+    if not hasattr(request, '_vehicle_state'):
+        # Every write bumps updated_at, rating changes from apply_review_delta()
+        # included; the category's covers its name in the payload
+        request._vehicle_state = (
+            Vehicle.objects.filter(pk=vehicle_id).values_list('updated_at', 'category__updated_at').first()
+        )
+    return request._vehicle_state
+
+
+def vehicle_etag(request, vehicle_id):
+    state = _vehicle_state(request, vehicle_id)
+    return _etag('vehicle', vehicle_id, *state) if state else None
+
+
+def vehicle_last_modified(request, vehicle_id):
+    state = _vehicle_state(request, vehicle_id)
+    return max(state) if state else None
+
+
+def _reviews_state(request, vehicle_id):
+    if not hasattr(request, '_reviews_state'):
+        request._reviews_state = Review.objects.filter(vehicle_id=vehicle_id).aggregate(
+            latest=Max('created_at'), total=Count('pk'),
+        )
+    return request._reviews_state
+
+
+def reviews_etag(request, vehicle_id):
+    state = _reviews_state(request, vehicle_id)
+    return _etag('reviews', vehicle_id, state['latest'], state['total'], _query_key(request))
+
+
+def reviews_last_modified(request, vehicle_id):
+    return _reviews_state(request, vehicle_id)['latest']
+
+
+def api_response(data, status=200):
+    response = JsonResponse(data, status=status)
+    # Clients may keep a copy but must revalidate it; that's what the ETag is for
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def _vehicle_row(row):
+    image = row.pop('image', '')
+    row['image_url'] = _image_storage.url(image) if image else None
+    if 'features' in row:
+        row['features'] = [feature.strip() for feature in row['features'].split(',') if feature.strip()]
+    if 'category__name' in row:
+        row['category'] = {'id': row.pop('category_id'), 'name': row.pop('category__name')}
+    return row
+
+
+def _review_row(row):
+    row['user'] = row.pop('user__username')
+    return row
+
+
+def _page_links(request, page):
+    urls = cursor_page_urls(request, page)
+    return {
+        'next': request.build_absolute_uri(urls['next_page_url']) if urls['next_page_url'] else None,
+        'previous': request.build_absolute_uri(urls['previous_page_url']) if urls['previous_page_url'] else None,
+    }
+
+
+@require_GET
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
+def vehicle_list(request):
+    """Available vehicles, filtered and sorted like the HTML list"""
+    search_form = VehicleSearchForm(request.GET)
+    if not search_form.is_valid():
+        return api_response({'errors': search_form.errors.get_json_data()}, status=400)
+    vehicles, ordering = filter_vehicles(search_form)
+
+    fields = VEHICLE_FIELDS + ('search_rank',) if 'search_rank' in ordering else VEHICLE_FIELDS
+    paginator = CursorPaginator(vehicles.values(*fields), API_PAGE_SIZE, ordering)
+    page = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
+    count, is_estimate = capped_count(vehicles, LISTING_COUNT_LIMIT)
+    return api_response({
+        'count': count,
+        'count_is_estimate': is_estimate,
+        **_page_links(request, page),
+        'results': [_vehicle_row(row) for row in page],
+    })
+
+
+@require_GET
+@condition(etag_func=vehicle_etag, last_modified_func=vehicle_last_modified)
+def vehicle_detail(request, vehicle_id):
+    row = Vehicle.objects.filter(pk=vehicle_id).values(*VEHICLE_DETAIL_FIELDS).first()
+    if row is None:
+        raise Http404('No vehicle matches the given query.')
+    return api_response(_vehicle_row(row))
+
+
+@require_GET
+@condition(etag_func=reviews_etag, last_modified_func=reviews_last_modified)
+def vehicle_reviews(request, vehicle_id):
+    if not Vehicle.objects.filter(pk=vehicle_id).exists():
+        raise Http404('No vehicle matches the given query.')
+    reviews = Review.objects.filter(vehicle_id=vehicle_id).values(*REVIEW_FIELDS)
+    paginator = CursorPaginator(reviews, API_PAGE_SIZE, REVIEW_ORDERING)
+    page = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
+    return api_response({
+        **_page_links(request, page),
+        'results': [_review_row(row) for row in page],
+    })
+
+
+@require_GET
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
+def category_list(request):
+    categories = (
+        Category.objects.order_by('name')
+        .annotate(available_vehicles=Count('vehicle', filter=Q(vehicle__is_available=True)))
+        .values('id', 'name', 'description', 'icon_class', 'available_vehicles')
+    )
+    return api_response({'results': list(categories)})
@@ -1,6 +1,37 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+BOOKING_GUARD_MIGRATION = '0014_booking_overlap_guard'
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """
+    SQLite rebuilds myapp_vehicle for many schema changes, which drops the
+    FTS triggers; put them back after every migrate.
+    """
+    from django.db import connections
+    from .search import install_fts
+    install_fts(connections[using], repair_only=True)
+
+
+def ensure_booking_guard(sender, using, **kwargs):
+    """Same for the booking overlap triggers, once their migration has run"""
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    from .bookings import install_overlap_guard
+    connection = connections[using]
+    if ('myapp', BOOKING_GUARD_MIGRATION) in MigrationRecorder(connection).applied_migrations():
+        install_overlap_guard(connection)
 
 
 class MyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .sqlite import configure_sqlite
+        connection_created.connect(configure_sqlite)
+        post_migrate.connect(ensure_search_index, sender=self)
+        post_migrate.connect(ensure_booking_guard, sender=self)
@@ -0,0 +1,70 @@
+"""
+Hot/cold split of bookings.
+
+Bookings that ended more than settings.BOOKING_ARCHIVE_AFTER_DAYS ago are
+moved from Booking to ArchivedBooking by "manage.py archive_bookings", a
+batch at a time. Booking and its indexes then only hold the recent and
+upcoming rows that availability checks and the booking pages read all day.
+
+A user's history is still complete: BookingHistory lists their live
+bookings followed by the archived ones, and only reads the archive for
+pages that reach past the live rows.
+"""
+from django.db import transaction
+
+from .models import ArchivedBooking, Booking
+
+ARCHIVED_FIELDS = [field.attname for field in Booking._meta.concrete_fields]
+
+
+def archive_batch(cutoff, batch_size):
+    """Move up to ``batch_size`` bookings that ended before ``cutoff`` to the archive; return how many moved"""
+    with transaction.atomic():
+        # Oldest ids first: they ended long ago, so the scan finds a full
+        # batch early without needing an index on end_date
+        ids = list(
+            Booking.objects.filter(end_date__lt=cutoff).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        ArchivedBooking.objects.bulk_create(
+            ArchivedBooking(**row) for row in Booking.objects.filter(pk__in=ids).values(*ARCHIVED_FIELDS)
+        )
+        # Through the ORM so post_delete drops each user's cached counters,
+        # which were computed from both tables
+        Booking.objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+class BookingHistory:
+    """
+    A user's bookings for Paginator: live ones newest first, then archived
+    ones newest first. ``stats`` is what get_booking_stats() returns; being
+    cached it may lag behind, so it only sizes the paginator and never
+    decides which table a row comes from. Supports slicing only.
+    """
+    def __init__(self, user_id, stats):
+        self.user_id = user_id
+        self.total = stats['total']
+    
+    def count(self):
+        return self.total
+    
+    def __len__(self):
+        return self.total
+    
+    def __getitem__(self, index):
+        start = index.start or 0
+        live = Booking.objects.filter(user_id=self.user_id).select_related('vehicle').order_by('-created_at')
+        rows = list(live[start:index.stop])
+        if index.stop is not None and len(rows) >= index.stop - start:
+            return rows
+        # Short of live rows: the page continues into the archive. Where it
+        # starts there depends on how many live rows there really are
+        if rows or not start:
+            offset = 0
+        else:
+            offset = max(start - live.count(), 0)
+        archived = ArchivedBooking.objects.filter(user_id=self.user_id).select_related('vehicle').order_by('-created_at')
+        stop = None if index.stop is None else offset + index.stop - start - len(rows)
+        return rows + list(archived[offset:stop])
@@ -0,0 +1,19 @@
+"""
+myapp's URLs for ASGI: the same routes and names as myapp/urls.py, with the
+read-heavy pages served by their async versions.
+"""
+from django.urls import path
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+ASYNC_VIEWS = {
+    'home': async_views.home,
+    'vehicle_list': async_views.vehicle_list,
+    'vehicle_detail': async_views.vehicle_detail,
+    'category_vehicles': async_views.category_vehicles,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name) if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in sync_urlpatterns
+]
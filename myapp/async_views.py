@@ -0,0 +1,103 @@
+"""
+Async versions of the read-heavy pages, served under ASGI through
+myapp/async_urls.py (vehicles/asgi.py selects it).
+
+Each view loads everything its template needs with the async ORM, awaiting
+independent queries together, then renders in a worker thread, since
+rendering can still touch the lazily loaded session and user.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.shortcuts import render
+
+from .caching import aget_home_context, get_vehicle_facets
+from .forms import VehicleSearchForm
+from .models import Category, Review, Vehicle
+from .pagination import CursorPaginator, acapped_count
+from .views import (
+    LISTING_COUNT_LIMIT, cursor_page_urls, filter_vehicles, similar_vehicles_for, vehicle_list_context,
+)
+
+arender = sync_to_async(render)
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+async def aget_or_404(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+
+
+async def home(request):
+    """Home page with featured vehicles and categories"""
+    return await arender(request, 'myapp/home.html', await aget_home_context())
+
+
+async def vehicle_list(request):
+    """Display all available vehicles with search and filtering"""
+    search_form = VehicleSearchForm(request.GET)
+    # Validation looks up the chosen category and features
+    await sync_to_async(search_form.is_valid)()
+    vehicles, ordering = filter_vehicles(search_form)
+
+    paginator = CursorPaginator(vehicles, 12, ordering)
+    page_obj, total, facets = await asyncio.gather(
+        paginator.aget_page(after=request.GET.get('after'), before=request.GET.get('before')),
+        acapped_count(vehicles, LISTING_COUNT_LIMIT),
+        sync_to_async(get_vehicle_facets)(vehicles, search_form.filter_signature()),
+    )
+    context = vehicle_list_context(request, search_form, page_obj, total, facets)
+    return await arender(request, 'myapp/vehicle_list.html', context)
+
+
+async def vehicle_detail(request, vehicle_id):
+    """Display detailed information about a specific vehicle"""
+    vehicle, user = await asyncio.gather(aget_or_404(Vehicle.objects, id=vehicle_id), request.auser())
+
+    async def user_review():
+        if user.is_authenticated:
+            return await Review.objects.filter(user=user, vehicle=vehicle).afirst()
+        return None
+
+    reviews, user_review, similar_vehicles = await asyncio.gather(
+        alist(Review.objects.filter(vehicle=vehicle).select_related('user').order_by('-created_at')),
+        user_review(),
+        alist(similar_vehicles_for(vehicle)),
+    )
+    context = {
+        'vehicle': vehicle,
+        'reviews': reviews,
+        'avg_rating': round(vehicle.avg_rating, 1),
+        'user_review': user_review,
+        'similar_vehicles': similar_vehicles,
+    }
+    return await arender(request, 'myapp/vehicle_detail.html', context)
+
+
+async def category_vehicles(request, category_id):
+    """Display vehicles by category with pagination"""
+    category = await aget_or_404(Category.objects, id=category_id)
+    vehicles = Vehicle.objects.filter(category=category, is_available=True)
+
+    paginator = CursorPaginator(vehicles, 9, Vehicle.LISTING_ORDERINGS['newest'])
+    page_obj, (total_vehicles, total_is_estimate), all_categories = await asyncio.gather(
+        paginator.aget_page(after=request.GET.get('after'), before=request.GET.get('before')),
+        acapped_count(vehicles, LISTING_COUNT_LIMIT),
+        alist(Category.objects.all()),
+    )
+    context = {
+        'category': category,
+        'page_obj': page_obj,
+        'vehicles': page_obj,
+        'all_categories': all_categories,
+        'total_vehicles': total_vehicles,
+        'total_is_estimate': total_is_estimate,
+        **cursor_page_urls(request, page_obj),
+    }
+    return await arender(request, 'myapp/category_vehicles.html', context)
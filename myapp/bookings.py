@@ -0,0 +1,110 @@
+"""
+Race-free booking creation.
+
+Checking for an overlapping booking and then inserting is only safe if no
+other request can do the same for that vehicle in between. ``reserve()``
+runs both in one transaction while holding a per-vehicle lock: the vehicle
+row via SELECT ... FOR UPDATE where the backend has row locks, SQLite's
+database write lock otherwise. The database refuses overlaps as well (an
+exclusion constraint on PostgreSQL, triggers on SQLite), so writes that
+bypass ``reserve()`` can't double-book either.
+"""
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import F
+
+from .models import Booking, Vehicle
+
+GUARD_NAME = 'myapp_booking_no_overlap'
+
+_blocking = ', '.join(f"'{status}'" for status in Booking.BLOCKING_STATUSES)
+_overlap = f"""
+    SELECT RAISE(ABORT, '{GUARD_NAME}') WHERE EXISTS (
+        SELECT 1 FROM myapp_booking b
+        WHERE b.vehicle_id = new.vehicle_id AND b.id IS NOT new.id AND b.status IN ({_blocking})
+          AND b.start_date < new.end_date AND b.end_date > new.start_date
+    );
+"""
+
+# SQLite stores datetimes as ISO text, which compares in time order
+SQLITE_TRIGGERS = {
+    f'{GUARD_NAME}_bi': f"""
+        CREATE TRIGGER {GUARD_NAME}_bi BEFORE INSERT ON myapp_booking
+        WHEN new.status IN ({_blocking}) BEGIN {_overlap} END
+    """,
+    f'{GUARD_NAME}_bu': f"""
+        CREATE TRIGGER {GUARD_NAME}_bu BEFORE UPDATE OF vehicle_id, start_date, end_date, status ON myapp_booking
+        WHEN new.status IN ({_blocking}) BEGIN {_overlap} END
+    """,
+}
+
+POSTGRES_CONSTRAINT = f"""
+    ALTER TABLE myapp_booking ADD CONSTRAINT {GUARD_NAME} EXCLUDE USING gist (
+        vehicle_id WITH =, tstzrange(start_date, end_date, '[)') WITH &&
+    ) WHERE (status IN ({_blocking}))
+"""
+
+
+class BookingConflict(Exception):
+    """The vehicle can't be booked for the requested dates"""
+
+
+def install_overlap_guard(connection):
+    """Add the database-level overlap check where it's missing"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s)", [*SQLITE_TRIGGERS],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            for name, sql in SQLITE_TRIGGERS.items():
+                if name not in existing:
+                    cursor.execute(sql)
+        elif connection.vendor == 'postgresql':
+            cursor.execute('SELECT 1 FROM pg_constraint WHERE conname = %s', [GUARD_NAME])
+            if cursor.fetchone() is None:
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+                cursor.execute(POSTGRES_CONSTRAINT)
+
+
+def uninstall_overlap_guard(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'ALTER TABLE myapp_booking DROP CONSTRAINT IF EXISTS {GUARD_NAME}')
+
+
+def lock_vehicle(vehicle_id, using):
+    """
+    Hold the vehicle's booking lock until the current transaction ends.
+    Returns its is_available flag as seen under the lock, or None if it's gone.
+    """
+    vehicles = Vehicle.objects.using(using).filter(pk=vehicle_id)
+    if connections[using].features.has_select_for_update:
+        return vehicles.select_for_update().values_list('is_available', flat=True).first()
+    # No row locks: a write that changes nothing takes the database write
+    # lock now, before the conflict check reads anything
+    vehicles.update(is_available=F('is_available'))
+    return vehicles.values_list('is_available', flat=True).first()
+
+
+def reserve(booking):
+    """
+    Price and save a new ``booking`` unless it clashes with another one.
+    Raises BookingConflict, leaving nothing saved, when it does.
+    """
+    using = router.db_for_write(Booking, instance=booking)
+    try:
+        with transaction.atomic(using=using):
+            if not lock_vehicle(booking.vehicle_id, using):
+                raise BookingConflict('This vehicle is not available for booking.')
+            if booking.has_conflict(using=using):
+                raise BookingConflict('This vehicle is already booked for the selected dates.')
+            booking.total_amount = booking.calculate_total_amount()
+            booking.save(using=using)
+    except IntegrityError as e:
+        if GUARD_NAME not in str(e):
+            raise
+        raise BookingConflict('This vehicle is already booked for the selected dates.') from e
+    return booking
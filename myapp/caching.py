@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from .models import Vehicle, Category, Booking, ArchivedBooking
+
+HOME_CONTEXT_KEY = 'myapp:home:context'
+BOOKING_STATS_KEY = 'myapp:booking-stats:{}'
+# Bumped whenever vehicles or categories change; cached facets and API
+# ETags include it
+CATALOG_VERSION_KEY = 'myapp:catalog:version'
+FACETS_KEY = 'myapp:facets:{}:{}'
+
+
+def _home_querysets():
+    return (
+        # One GROUP BY instead of a COUNT per vehicle type
+        Vehicle.objects.filter(is_available=True).order_by().values_list('vehicle_type').annotate(total=Count('id')),
+        Vehicle.objects.filter(is_available=True).order_by('-created_at')[:6],
+        Category.objects.all(),
+    )
+
+
+def _home_context(counts, featured_vehicles, categories):
+    counts = dict(counts)
+    return {
+        'featured_vehicles': featured_vehicles,
+        'categories': categories,
+        'bike_count': counts.get('bike', 0),
+        'car_count': counts.get('car', 0),
+        'traveller_count': counts.get('traveller', 0),
+    }
+
+
+def get_home_context():
+    """Featured vehicles, categories and per-type counts for the home page"""
+    context = cache.get(HOME_CONTEXT_KEY)
+    if context is not None:
+        return context
+
+    context = _home_context(*(list(queryset) for queryset in _home_querysets()))
+    cache.set(HOME_CONTEXT_KEY, context, settings.HOME_CACHE_TIMEOUT)
+    return context
+
+
+async def aget_home_context():
+    """get_home_context() for async views, with the three queries awaited together"""
+    context = await cache.aget(HOME_CONTEXT_KEY)
+    if context is not None:
+        return context
+
+    async def fetch(queryset):
+        return [row async for row in queryset]
+
+    context = _home_context(*await asyncio.gather(*(fetch(queryset) for queryset in _home_querysets())))
+    await cache.aset(HOME_CONTEXT_KEY, context, settings.HOME_CACHE_TIMEOUT)
+    return context
+
+
+def invalidate_home_context():
+    cache.delete(HOME_CONTEXT_KEY)
+
+
+def booking_stats(user_id):
+    """Counters over a user's live and archived bookings, plus how many are archived"""
+    live = Booking.objects.filter(user_id=user_id).stats()
+    archived = ArchivedBooking.objects.filter(user_id=user_id).stats()
+    return {key: live[key] + archived[key] for key in live} | {'archived': archived['total']}
+
+
+def get_booking_stats(user_id):
+    """Booking counters for a user, served from the cache when enabled"""
+    timeout = settings.BOOKING_STATS_CACHE_TIMEOUT
+    if not timeout:
+        return booking_stats(user_id)
+
+    key = BOOKING_STATS_KEY.format(user_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = booking_stats(user_id)
+        cache.set(key, stats, timeout)
+    return stats
+
+
+def invalidate_booking_stats(user_id):
+    cache.delete(BOOKING_STATS_KEY.format(user_id))
+
+
+def get_vehicle_facets(queryset, signature):
+    """
+    Facet counts for a filtered vehicle queryset. ``signature`` identifies the
+    filter set; results are shared between requests with the same filters.
+    """
+    timeout = settings.FACET_CACHE_TIMEOUT
+    if not timeout or signature is None:
+        return queryset.facet_counts()
+
+    # Bumping the version orphans every cached filter combination at once
+    key = FACETS_KEY.format(catalog_version(), hashlib.sha1(signature.encode()).hexdigest())
+    facets = cache.get(key)
+    if facets is None:
+        facets = queryset.facet_counts()
+        cache.set(key, facets, timeout)
+    return facets
+
+
+def catalog_version():
+    return cache.get_or_set(CATALOG_VERSION_KEY, 1, None)
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        pass
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def fragment_caching(request):
+    """Timeout for the {% cache %} blocks around vehicle cards"""
+    return {'card_cache_timeout': settings.VEHICLE_CARD_CACHE_TIMEOUT}
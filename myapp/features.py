@@ -0,0 +1,42 @@
+"""
+Helpers for the normalized feature catalog.
+
+Every Feature gets a bit position, so a vehicle's features also fit in one
+integer (Vehicle.feature_mask) and "has all of these" becomes a single
+bitwise test. A signed 64-bit column gives 63 usable bits; features past
+that get no bit and are filtered through the many-to-many table instead.
+"""
+from django.utils.text import slugify
+
+MAX_FEATURE_BITS = 63
+
+
+def parse_features(text):
+    """
+    Split a comma-separated feature string into (slug, name) pairs, keeping
+    the first spelling of each feature and dropping duplicates.
+    """
+    seen = {}
+    for part in (text or '').split(','):
+        name = ' '.join(part.split())
+        slug = slugify(name)[:100]
+        if slug and slug not in seen:
+            seen[slug] = name[:100]
+    return list(seen.items())
+
+
+def mask_for_bits(bits):
+    mask = 0
+    for bit in bits:
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def next_free_bit(used_bits):
+    """Lowest unused bit position, or None once all of them are taken"""
+    used = set(used_bits)
+    for bit in range(MAX_FEATURE_BITS):
+        if bit not in used:
+            return bit
+    return None
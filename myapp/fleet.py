@@ -0,0 +1,50 @@
+"""Bulk vehicle writes shared by import_fleet and generate_demo_data"""
+from django.db import transaction
+
+from .features import mask_for_bits, parse_features
+from .models import Feature, Vehicle
+
+# Columns overwritten when a fleet_code already exists; created_at and the
+# rating/image columns are left alone
+UPSERT_FIELDS = [
+    'name', 'category', 'vehicle_type', 'brand', 'model', 'year', 'fuel_type', 'transmission', 'seats',
+    'price_per_day', 'price_per_hour', 'description', 'features', 'feature_mask', 'mileage', 'color',
+    'is_available', 'updated_at',
+]
+
+
+def upsert_vehicles(vehicles, catalog):
+    """
+    Insert or update unsaved vehicles keyed by fleet_code in one transaction,
+    including feature masks and feature_tags rows, which Vehicle.save() would
+    otherwise maintain one row at a time. ``catalog`` is a {slug: Feature}
+    cache that is extended with any features created on the way.
+    Returns the number of vehicles written.
+    """
+    # Later rows win when a batch repeats a fleet_code
+    vehicles = list({vehicle.fleet_code: vehicle for vehicle in vehicles}.values())
+    parsed = {vehicle.fleet_code: parse_features(vehicle.features) for vehicle in vehicles}
+
+    with transaction.atomic():
+        new_pairs = {pair for pairs in parsed.values() for pair in pairs if pair[0] not in catalog}
+        if new_pairs:
+            catalog.update(Feature.objects.resolve_pairs(sorted(new_pairs)))
+        for vehicle in vehicles:
+            vehicle.feature_mask = mask_for_bits(catalog[slug].bit for slug, _ in parsed[vehicle.fleet_code])
+
+        Vehicle.objects.bulk_create(
+            vehicles,
+            update_conflicts=True,
+            unique_fields=['fleet_code'],
+            update_fields=UPSERT_FIELDS,
+        )
+
+        ids = dict(Vehicle.objects.filter(fleet_code__in=parsed).values_list('fleet_code', 'pk'))
+        through = Vehicle.feature_tags.through
+        through.objects.filter(vehicle_id__in=ids.values()).delete()
+        through.objects.bulk_create([
+            through(vehicle_id=ids[code], feature_id=catalog[slug].pk)
+            for code, pairs in parsed.items()
+            for slug, _ in pairs
+        ])
+    return len(vehicles)
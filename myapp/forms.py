@@ -2,7 +2,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.utils import timezone
-from .models import UserProfile, Booking, Review
+from .models import UserProfile, Booking, Review, Feature, Category
 from datetime import datetime, timedelta
 
 class UserRegistrationForm(UserCreationForm):
@@ -115,12 +115,112 @@ class ReviewForm(forms.ModelForm):
         }
 
 class VehicleSearchForm(forms.Form):
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Search name, brand, model or features'})
+    )
     vehicle_type = forms.ChoiceField(
         choices=[('', 'All Types'), ('bike', 'Bike'), ('car', 'Car'), ('traveller', 'Traveller')],
         required=False,
         widget=forms.Select(attrs={'class': 'form-control'})
     )
     brand = forms.CharField(required=False, widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Brand'}))
+    category = forms.ModelChoiceField(queryset=Category.objects.all(), required=False, widget=forms.HiddenInput)
+    fuel_type = forms.CharField(required=False, max_length=50, widget=forms.HiddenInput)
+    transmission = forms.CharField(required=False, max_length=50, widget=forms.HiddenInput)
     min_price = forms.DecimalField(required=False, widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Min Price'}))
     max_price = forms.DecimalField(required=False, widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Max Price'}))
     seats = forms.IntegerField(required=False, widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Min Seats'}))
+    features = forms.ModelMultipleChoiceField(
+        queryset=Feature.objects.all(),
+        to_field_name='slug',
+        required=False,
+        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'})
+    )
+    sort = forms.ChoiceField(
+        choices=[
+            ('', 'Best Match'),
+            ('newest', 'Newest First'),
+            ('price_asc', 'Price: Low to High'),
+            ('price_desc', 'Price: High to Low'),
+            ('rating', 'Top Rated'),
+        ],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    start = forms.DateTimeField(
+        required=False,
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+        input_formats=['%Y-%m-%dT%H:%M']
+    )
+    end = forms.DateTimeField(
+        required=False,
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+        input_formats=['%Y-%m-%dT%H:%M']
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+        
+        if bool(start) != bool(end):
+            raise forms.ValidationError("Select both start and end dates to check availability")
+        
+        if start and end and end <= start:
+            raise forms.ValidationError("End date must be after start date")
+        
+        return cleaned_data
+    
+    # Fields that change which vehicles match, as opposed to their order
+    FILTER_FIELDS = ('q', 'vehicle_type', 'brand', 'category', 'fuel_type', 'transmission',
+                     'min_price', 'max_price', 'seats', 'features')
+    
+    def filter_signature(self):
+        """
+        Stable string identifying the filter set, for caching per-filter
+        results. None when results also depend on bookings (date range).
+        """
+        if not self.is_valid():
+            return ''
+        if self.cleaned_data.get('start'):
+            return None
+        parts = []
+        for name in self.FILTER_FIELDS:
+            value = self.cleaned_data.get(name)
+            if name == 'features':
+                value = ','.join(sorted(feature.slug for feature in value or ()))
+            elif name == 'category':
+                value = value.pk if value else ''
+            parts.append(f'{name}={value if value is not None else ""}')
+        return '&'.join(parts)
+
+class QuoteForm(forms.Form):
+    """Query parameters of the price quote endpoint"""
+    MAX_VEHICLES = 100
+    
+    start = forms.DateTimeField(input_formats=['%Y-%m-%dT%H:%M'])
+    end = forms.DateTimeField(input_formats=['%Y-%m-%dT%H:%M'])
+    ids = forms.CharField(help_text="Comma-separated vehicle ids")
+    
+    def clean_ids(self):
+        try:
+            ids = sorted({int(value) for value in self.cleaned_data['ids'].split(',') if value.strip()})
+        except ValueError:
+            raise forms.ValidationError("Vehicle ids must be numbers")
+        if not ids:
+            raise forms.ValidationError("Give at least one vehicle id")
+        if len(ids) > self.MAX_VEHICLES:
+            raise forms.ValidationError(f"At most {self.MAX_VEHICLES} vehicles can be quoted at once")
+        return ids
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+        
+        if start and end and end <= start:
+            raise forms.ValidationError("End date must be after start date")
+        
+        return cleaned_data
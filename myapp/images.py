@@ -0,0 +1,150 @@
+import hashlib
+import re
+from collections import OrderedDict, namedtuple
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+# Derivative name -> target width in pixels
+DERIVATIVE_WIDTHS = {
+    'thumb': 320,
+    'card': 640,
+    'detail': 1280,
+}
+
+# File extension -> (PIL format, save options)
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+IMAGE_MAX_BYTES = 10 * 1024 * 1024  # 10MB
+IMAGE_MAX_DIMENSION = 4000
+
+ImageInfo = namedtuple('ImageInfo', 'sha256 format width height size')
+
+# (sha256, allowed formats) -> (error message, ImageInfo), so re-submitting
+# the same bytes never parses them again
+_validation_results = OrderedDict()
+_VALIDATION_CACHE_SIZE = 1024
+
+DERIVATIVE_PATTERN = re.compile(r'__(%s)\.(%s)$' % ('|'.join(DERIVATIVE_WIDTHS), '|'.join(DERIVATIVE_FORMATS)))
+
+
+def derivative_name(name, size, ext):
+    """vehicles/car.png -> vehicles/car.png__card.webp (car.jpg and car.png must not share files)"""
+    return f'{name}__{size}.{ext}'
+
+
+def is_derivative(name):
+    return bool(DERIVATIVE_PATTERN.search(name))
+
+
+def delete_derivatives(name, storage=None):
+    """Remove every derivative of an image, leaving the original alone"""
+    storage = storage or default_storage
+    for size in DERIVATIVE_WIDTHS:
+        for ext in DERIVATIVE_FORMATS:
+            storage.delete(derivative_name(name, size, ext))
+
+
+def generate_derivatives(name, storage=None):
+    """Write every size/format derivative of an uploaded image next to it"""
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as fh:
+        with Image.open(fh) as original:
+            original.load()
+    if original.mode not in ('RGB', 'RGBA', 'L'):
+        original = original.convert('RGBA')
+
+    for size, width in DERIVATIVE_WIDTHS.items():
+        resized = original.copy()
+        # thumbnail() keeps the aspect ratio and never upscales
+        resized.thumbnail((width, width * 4), Image.LANCZOS)
+
+        for ext, (pil_format, options) in DERIVATIVE_FORMATS.items():
+            image = resized
+            if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            buffer = BytesIO()
+            image.save(buffer, pil_format, **options)
+
+            target = derivative_name(name, size, ext)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    return name
+
+
+def file_digest(f):
+    """sha256 of a file's content, leaving the file positioned at the start"""
+    digest = hashlib.sha256()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(64 * 1024), b''):
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def read_image_info(f, size, digest=''):
+    """Format and dimensions from the image header; pixel data is never decoded"""
+    try:
+        with Image.open(f) as img:
+            return ImageInfo(digest, img.format, img.width, img.height, size)
+    finally:
+        f.seek(0)
+
+
+def _check_image(value, digest, allowed_formats, format_error):
+    """Returns (error message or None, ImageInfo or None)"""
+    try:
+        info = read_image_info(value, value.size, digest)
+    except Exception as e:
+        return f'Invalid image file: {str(e)}', None
+    if info.format not in allowed_formats:
+        return format_error, None
+    if info.width > IMAGE_MAX_DIMENSION or info.height > IMAGE_MAX_DIMENSION:
+        return 'Image dimensions cannot exceed 4000x4000 pixels.', None
+    return None, info
+
+
+def validate_image_upload(value, allowed_formats, format_error):
+    """
+    Shared validator for image uploads. Returns an ImageInfo for the upload.
+
+    Files already in storage were validated when they were uploaded, so they
+    are skipped without touching storage. A new upload is validated once: the
+    result is remembered on the upload object and, keyed by content hash, in a
+    small process-wide cache, so repeated model/form validation is free.
+    """
+    if getattr(value, '_committed', False):
+        return None
+
+    # FieldFile wrappers come and go; the uploaded file underneath is stable
+    upload = getattr(value, 'file', value)
+    memo = getattr(upload, '_image_validation', None)
+    if memo and memo[0] == allowed_formats:
+        return memo[1]
+
+    # Before hashing, so an oversized upload is never read
+    if value.size > IMAGE_MAX_BYTES:
+        raise ValidationError('File size cannot exceed 10MB.')
+
+    digest = file_digest(value)
+    key = (digest, allowed_formats)
+    if key in _validation_results:
+        _validation_results.move_to_end(key)
+        error, info = _validation_results[key]
+    else:
+        error, info = _check_image(value, digest, allowed_formats, format_error)
+        _validation_results[key] = (error, info)
+        if len(_validation_results) > _VALIDATION_CACHE_SIZE:
+            _validation_results.popitem(last=False)
+
+    if error:
+        raise ValidationError(error)
+    upload._image_validation = (allowed_formats, info)
+    return info
@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from myapp.archive import archive_batch
+
+
+class Command(BaseCommand):
+    help = ('Move bookings that ended more than --days ago from the live booking table to the archive, '
+            'in small batches, each in its own short transaction')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.BOOKING_ARCHIVE_AFTER_DAYS,
+                            help='Archive bookings that ended at least this many days ago')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='Seconds to pause between batches, to leave room for other writers')
+        parser.add_argument('--max-batches', type=int,
+                            help='Stop after this many batches; run again to continue')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        started = time.monotonic()
+        archived = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            moved = archive_batch(cutoff, options['batch_size'])
+            archived += moved
+            batches += 1
+            if moved < options['batch_size']:
+                break
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Archived {archived} bookings so far')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully archived {archived} bookings that ended before {cutoff:%Y-%m-%d} in {batches} batches '
+            f'({archived / elapsed if elapsed else 0:.0f} rows/s)!'
+        ))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from myapp.images import file_digest, read_image_info
+from myapp.models import Vehicle
+
+# updated_at too: the width feeds the srcset of cached cards, which are keyed by it
+METADATA_FIELDS = ['image_sha256', 'image_format', 'image_width', 'image_height', 'image_bytes', 'updated_at']
+
+class Command(BaseCommand):
+    help = 'Store width, height, format, size and hash of existing vehicle images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of vehicles written per bulk update')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-read images that already have metadata')
+
+    def handle(self, *args, **options):
+        vehicles = Vehicle.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['force']:
+            vehicles = vehicles.filter(image_width__isnull=True)
+        
+        batch = []
+        updated = 0
+        for vehicle in vehicles.only('pk', 'image').iterator(chunk_size=options['batch_size']):
+            try:
+                with vehicle.image.open('rb') as fh:
+                    info = read_image_info(fh, vehicle.image.size, file_digest(fh))
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Skipped {vehicle.image.name}: {e}'))
+                continue
+            
+            vehicle.set_image_info(info)
+            vehicle.updated_at = timezone.now()
+            batch.append(vehicle)
+            if len(batch) >= options['batch_size']:
+                updated += Vehicle.objects.bulk_update(batch, METADATA_FIELDS)
+                batch = []
+        
+        if batch:
+            updated += Vehicle.objects.bulk_update(batch, METADATA_FIELDS)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully stored image metadata for {updated} vehicles!')
+        )
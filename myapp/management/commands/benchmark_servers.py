@@ -0,0 +1,153 @@
+import asyncio
+import io
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from myapp.models import Category, Vehicle
+
+from .benchmark_views import git_revision, percentile
+
+# Served by async views under ASGI (see myapp/async_urls.py)
+ROUTES = ('home', 'vehicle_list', 'vehicle_detail', 'category_vehicles')
+URLCONFS = {'wsgi': 'vehicles.urls', 'asgi': 'vehicles.asgi_urls'}
+
+
+def wsgi_request(application, url):
+    """One GET through the WSGI handler, as a threaded WSGI server would make it"""
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': parts.path, 'QUERY_STRING': parts.query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'testserver',
+        'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    status = []
+    started = time.perf_counter()
+    response = application(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0])))
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return status[0], (time.perf_counter() - started) * 1000
+
+
+async def asgi_request(application, url):
+    """One GET through the ASGI handler, as an ASGI server would make it"""
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': parts.path, 'raw_path': parts.path.encode(), 'query_string': parts.query.encode(),
+        'root_path': '', 'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+    }
+    disconnected = asyncio.Event()
+    body_sent = False
+    status = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client stays connected; Django stops listening once it has responded
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return status[0], (time.perf_counter() - started) * 1000
+
+
+class Command(BaseCommand):
+    help = ('Compare requests/s and tail latency of the read-heavy pages served by the WSGI handler '
+            '(sync views, thread per request) and the ASGI handler (async views) at a given concurrency')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=64,
+                            help='Requests in flight at once: WSGI threads, or ASGI tasks')
+        parser.add_argument('--requests', type=int, default=400,
+                            help='Requests per route and server')
+        parser.add_argument('--servers', nargs='+', choices=URLCONFS, default=list(URLCONFS))
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        vehicle = Vehicle.objects.filter(is_available=True).order_by('-review_count').first()
+        category = Category.objects.order_by('pk').first()
+        if not (vehicle and category):
+            raise CommandError('Needs at least one vehicle and category; run generate_demo_data first')
+        args = {'vehicle_id': vehicle.pk, 'category_id': category.pk}
+
+        report = {
+            'revision': git_revision(),
+            'database': connections['default'].vendor,
+            'concurrency': options['concurrency'],
+            'requests': options['requests'],
+            'servers': {},
+        }
+        allowed_hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        for server in options['servers']:
+            with override_settings(ROOT_URLCONF=URLCONFS[server], ALLOWED_HOSTS=allowed_hosts, DEBUG=False):
+                results = {}
+                for name in ROUTES:
+                    url = reverse(name, kwargs={key: args[key] for key in (
+                        ('vehicle_id',) if name == 'vehicle_detail' else ('category_id',) if name == 'category_vehicles' else ()
+                    )})
+                    results[name] = self.measure(server, url, options)
+                report['servers'][server] = results
+            self.stdout.write(f'Measured {server}')
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Successfully wrote server benchmark to {options["output"]}!'))
+        else:
+            self.stdout.write(output)
+
+    def measure(self, server, url, options):
+        total, concurrency = options['requests'], options['concurrency']
+        started = time.perf_counter()
+        if server == 'wsgi':
+            application = WSGIHandler()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(lambda _: wsgi_request(application, url), range(total)))
+        else:
+            application = get_asgi_application()
+            results = asyncio.run(self.run_asgi(application, url, total, concurrency))
+        elapsed = time.perf_counter() - started
+        connections.close_all()
+
+        timings = [ms for _, ms in results]
+        return {
+            'url': url,
+            'statuses': sorted({status for status, _ in results}),
+            'requests_per_second': round(total / elapsed, 1),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+        }
+
+    async def run_asgi(self, application, url, total, concurrency):
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with slots:
+                return await asgi_request(application, url)
+
+        return await asyncio.gather(*(one() for _ in range(total)))
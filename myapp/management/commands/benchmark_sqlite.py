@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.utils import timezone
+from myapp.bookings import BookingConflict, reserve
+from myapp.models import Booking, Vehicle
+
+from .benchmark_views import percentile
+
+PROFILES = ('default', 'production')
+
+
+def run_worker(job):
+    """Worker: mixed reads and booking writes until the deadline, return counts and latencies"""
+    profile, path, seed, deadline, write_ratio, user_id, vehicle_ids, window_start = job
+    # Forked workers must not share the parent's connections; point
+    # "default" at this profile's copy before the first query reconnects
+    connections.close_all()
+    settings.SQLITE_PRODUCTION = profile == 'production'
+    database = connections['default']
+    options = {key: value for key, value in database.settings_dict['OPTIONS'].items() if key != 'transaction_mode'}
+    if settings.SQLITE_PRODUCTION:
+        options['transaction_mode'] = 'IMMEDIATE'
+    database.settings_dict.update(NAME=path, OPTIONS=options)
+
+    rng = random.Random(seed)
+    result = {'reads': [], 'writes': [], 'conflicts': 0, 'locked': 0}
+    while time.time() < deadline:
+        write = rng.random() < write_ratio
+        vehicle_id = rng.choice(vehicle_ids)
+        started = time.perf_counter()
+        try:
+            if write:
+                start = window_start + timedelta(hours=rng.randrange(24 * 365 * 5))
+                reserve(Booking(
+                    user_id=user_id, vehicle_id=vehicle_id, start_date=start, end_date=start + timedelta(hours=6),
+                    pickup_location='benchmark', return_location='benchmark',
+                ))
+            else:
+                # Roughly what a list page plus a detail page read
+                list(Vehicle.objects.filter(is_available=True).order_by('-created_at', '-id')
+                     .values('id', 'name', 'price_per_day')[:12])
+                Booking.objects.blocking().filter(vehicle_id=vehicle_id, end_date__gte=window_start).exists()
+        except BookingConflict:
+            result['conflicts'] += 1
+        except OperationalError:
+            result['locked'] += 1
+            continue
+        result['writes' if write else 'reads'].append((time.perf_counter() - started) * 1000)
+    connections.close_all()
+    return result
+
+
+class Command(BaseCommand):
+    help = ('Measure mixed read/write throughput from several processes on copies of the SQLite '
+            'database, with the default settings and with the SQLITE_PRODUCTION profile')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0,
+                            help='Seconds to run each profile for')
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help='Share of operations that create a booking')
+        parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        primary = connections['default']
+        if primary.vendor != 'sqlite' or primary.is_in_memory_db():
+            raise CommandError('Needs a file-based SQLite database')
+        user = User.objects.order_by('pk').first()
+        vehicle_ids = list(
+            Vehicle.objects.filter(is_available=True).order_by('pk').values_list('pk', flat=True)[:50]
+        )
+        if not user or not vehicle_ids:
+            raise CommandError('Needs at least one user and one available vehicle; run generate_demo_data first')
+        # Far enough ahead not to collide with real bookings
+        window_start = timezone.now() + timedelta(days=3650)
+
+        report = {'processes': options['processes'], 'duration': options['duration'],
+                  'write_ratio': options['write_ratio'], 'profiles': {}}
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in options['profiles']:
+                path = os.path.join(directory, f'{profile}.sqlite3')
+                self.copy_database(primary, path, 'WAL' if profile == 'production' else 'DELETE')
+                report['profiles'][profile] = self.run_profile(profile, path, user.pk, vehicle_ids, window_start, options)
+                self.stdout.write(f'Measured {profile} profile')
+
+        measured = report['profiles']
+        if len(measured) == 2:
+            report['speedup'] = round(measured['production']['ops_per_second'] / measured['default']['ops_per_second'], 2)
+        self.stdout.write(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS('Successfully benchmarked SQLite throughput!'))
+
+    def copy_database(self, primary, path, journal_mode):
+        primary.ensure_connection()
+        with sqlite3.connect(path) as target:
+            primary.connection.backup(target)
+            # The copy inherits the source's journal mode, which is kept in the file
+            target.execute(f'PRAGMA journal_mode = {journal_mode}')
+        target.close()
+
+    def run_profile(self, profile, path, user_id, vehicle_ids, window_start, options):
+        connections.close_all()
+        deadline = time.time() + options['duration']
+        jobs = [
+            (profile, path, options['seed'] + worker, deadline, options['write_ratio'], user_id, vehicle_ids, window_start)
+            for worker in range(options['processes'])
+        ]
+        started = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(options['processes']) as pool:
+            results = pool.map(run_worker, jobs)
+        elapsed = time.perf_counter() - started
+
+        reads = [ms for result in results for ms in result['reads']]
+        writes = [ms for result in results for ms in result['writes']]
+        return {
+            'reads': len(reads),
+            'writes': len(writes),
+            'conflicts': sum(result['conflicts'] for result in results),
+            'locked_errors': sum(result['locked'] for result in results),
+            'ops_per_second': round((len(reads) + len(writes)) / elapsed, 1),
+            'writes_per_second': round(len(writes) / elapsed, 1),
+            'read_p50_ms': round(statistics.median(reads), 2) if reads else None,
+            'read_p95_ms': round(percentile(reads, 95), 2) if reads else None,
+            'write_p95_ms': round(percentile(writes, 95), 2) if writes else None,
+        }
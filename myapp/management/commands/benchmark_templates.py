@@ -0,0 +1,87 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from myapp.caching import get_vehicle_facets
+from myapp.forms import VehicleSearchForm
+from myapp.pagination import CursorPaginator, capped_count
+from myapp.views import LISTING_COUNT_LIMIT, filter_vehicles, vehicle_list_context
+
+from .benchmark_views import git_revision, percentile
+
+FILE_LOADERS = ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader']
+
+# (cached template loader, cached vehicle cards)
+MODES = {
+    'uncached_loader': (False, False),
+    'cached_loader': (True, False),
+    'cached_loader_and_cards': (True, True),
+}
+
+
+def template_backend(cached_loader):
+    """A Django template engine like settings.TEMPLATES, with or without the cached loader"""
+    config = settings.TEMPLATES[0]
+    loaders = [('django.template.loaders.cached.Loader', FILE_LOADERS)] if cached_loader else FILE_LOADERS
+    return DjangoTemplates({
+        'NAME': 'benchmark', 'DIRS': config['DIRS'], 'APP_DIRS': False,
+        'OPTIONS': {**config['OPTIONS'], 'loaders': loaders},
+    })
+
+
+class Command(BaseCommand):
+    help = ('Time rendering the 12-card vehicle list page with and without the cached template '
+            'loader and the vehicle card fragment cache, and report it as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200,
+                            help='Measured renders per mode')
+        parser.add_argument('--warmup', type=int, default=5,
+                            help='Unmeasured renders per mode before timing')
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/vehicles/')
+        request.user = AnonymousUser()
+        search_form = VehicleSearchForm(request.GET)
+        vehicles, ordering = filter_vehicles(search_form)
+        page_obj = CursorPaginator(vehicles, 12, ordering).get_page()
+        if len(page_obj) < 12:
+            raise CommandError('Needs at least 12 available vehicles; run generate_demo_data first')
+        # Queries happen here, once; only rendering is timed
+        context = vehicle_list_context(
+            request, search_form, page_obj,
+            capped_count(vehicles, LISTING_COUNT_LIMIT),
+            get_vehicle_facets(vehicles, search_form.filter_signature()),
+        )
+
+        report = {'revision': git_revision(), 'cards': len(page_obj), 'iterations': options['iterations'], 'modes': {}}
+        for mode, (cached_loader, cached_cards) in MODES.items():
+            backend = template_backend(cached_loader)
+            caches['template_fragments'].clear()
+            timeout = settings.VEHICLE_CARD_CACHE_TIMEOUT if cached_cards else 0
+            with override_settings(VEHICLE_CARD_CACHE_TIMEOUT=timeout):
+                timings = []
+                for iteration in range(options['warmup'] + options['iterations']):
+                    started = time.perf_counter()
+                    backend.get_template('myapp/vehicle_list.html').render(context, request)
+                    if iteration >= options['warmup']:
+                        timings.append((time.perf_counter() - started) * 1000)
+            report['modes'][mode] = {
+                'mean_ms': round(statistics.mean(timings), 3),
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(percentile(timings, 95), 3),
+            }
+            self.stdout.write(f'Measured {mode}')
+
+        modes = report['modes']
+        report['speedup_from_cards'] = round(modes['cached_loader']['p50_ms'] / modes['cached_loader_and_cards']['p50_ms'], 2)
+        report['speedup_total'] = round(modes['uncached_loader']['p50_ms'] / modes['cached_loader_and_cards']['p50_ms'], 2)
+        self.stdout.write(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS('Successfully benchmarked template rendering!'))
@@ -0,0 +1,146 @@
+import json
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from myapp import urls
+from myapp.models import Booking, Category, Vehicle
+
+# Routes whose GET changes state; benchmarking them would mutate the data or
+# log the client out
+SKIPPED_ROUTES = {
+    'logout': 'logs the client out',
+    'cancel_booking': 'cancels a booking',
+    'add_review': 'POST only',
+}
+
+# Extra query strings for routes whose cost depends heavily on parameters
+ROUTE_VARIANTS = {
+    'vehicle_list': [
+        {'sort': 'price_asc'},
+        {'sort': 'rating'},
+        {'vehicle_type': 'car', 'seats': 5},
+        {'q': 'honda'},
+        {'features': ['ac', 'gps']},
+    ],
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Time every myapp route through the test client and report p50/p95 latency and query counts as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20,
+                            help='Measured requests per route')
+        parser.add_argument('--warmup', type=int, default=2,
+                            help='Unmeasured requests per route before timing')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Clear the cache before every request')
+        parser.add_argument('--username',
+                            help='User to log in as for login-only routes; defaults to the user with the most bookings')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if 'testserver' not in settings.ALLOWED_HOSTS and '*' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+
+        booking = self.sample_booking(options['username'])
+        vehicle = Vehicle.objects.filter(is_available=True).order_by('-review_count').first()
+        category = Category.objects.order_by('pk').first()
+        if not (booking and vehicle and category):
+            raise CommandError('Needs at least one booking, vehicle and category; run generate_demo_data first')
+
+        client = Client()
+        client.force_login(booking.user)
+        args = {'vehicle_id': vehicle.pk, 'category_id': category.pk, 'booking_id': booking.pk}
+
+        results = {}
+        for pattern in urls.urlpatterns:
+            name = pattern.name
+            if name in SKIPPED_ROUTES:
+                results[name] = {'skipped': SKIPPED_ROUTES[name]}
+                continue
+            kwargs = {key: args[key] for key in pattern.pattern.converters}
+            url = reverse(name, kwargs=kwargs)
+            results[name] = self.measure(client, url, {}, options)
+            for params in ROUTE_VARIANTS.get(name, []):
+                label = f"{name}?{'&'.join(f'{key}={value}' for key, value in params.items())}"
+                results[label] = self.measure(client, url, params, options)
+
+        report = {
+            'revision': git_revision(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'cold_cache': options['cold_cache'],
+            'dataset': {
+                'vehicles': Vehicle.objects.count(),
+                'bookings': Booking.objects.count(),
+            },
+            'routes': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Successfully wrote benchmark report to {options["output"]}!'))
+        else:
+            self.stdout.write(output)
+
+    def sample_booking(self, username):
+        bookings = Booking.objects.select_related('user').order_by('-pk')
+        if username:
+            return bookings.filter(user__username=username).first()
+        busiest = (
+            Booking.objects.order_by().values('user').annotate(n=Count('pk')).order_by('-n').values('user')[:1]
+        )
+        return bookings.filter(user__in=busiest).first()
+
+    def measure(self, client, url, params, options):
+        for _ in range(options['warmup']):
+            client.get(url, params)
+
+        timings = []
+        queries = []
+        status = None
+        for _ in range(options['iterations']):
+            if options['cold_cache']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = client.get(url, params)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(ctx.captured_queries))
+            status = response.status_code
+
+        return {
+            'url': url,
+            'status': status,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': max(queries),
+        }
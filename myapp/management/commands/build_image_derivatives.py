@@ -0,0 +1,62 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from myapp.images import generate_derivatives, is_derivative
+from myapp.models import Vehicle
+
+
+def _build(name):
+    """Worker entry point; returns (name, error message or None)"""
+    try:
+        generate_derivatives(name)
+        return name, None
+    except Exception as e:
+        return name, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Build thumbnail/card/detail WebP and JPEG derivatives for vehicle images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Number of worker processes')
+        parser.add_argument('--force', action='store_true',
+                            help='Rebuild derivatives for vehicles that already have them')
+        parser.add_argument('--all-files', action='store_true',
+                            help='Also process files in media/vehicles that no vehicle references')
+
+    def handle(self, *args, **options):
+        vehicles = Vehicle.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['force']:
+            vehicles = vehicles.filter(has_image_derivatives=False)
+        names = set(vehicles.values_list('image', flat=True))
+
+        if options['all_files'] and default_storage.exists('vehicles'):
+            _, files = default_storage.listdir('vehicles')
+            names.update(f'vehicles/{f}' for f in files if not is_derivative(f))
+
+        if not names:
+            self.stdout.write('No images need derivatives.')
+            return
+
+        self.stdout.write(f'Building derivatives for {len(names)} images with {options["workers"]} workers...')
+        built = []
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+            futures = [pool.submit(_build, name) for name in sorted(names)]
+            for future in as_completed(futures):
+                name, error = future.result()
+                if error:
+                    self.stdout.write(self.style.WARNING(f'Skipped {name}: {error}'))
+                else:
+                    built.append(name)
+                    self.stdout.write(f'Built derivatives for {name}')
+
+        # Bumping updated_at retires the cached cards that still show the original
+        Vehicle.objects.filter(image__in=built).update(has_image_derivatives=True, updated_at=timezone.now())
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully built derivatives for {len(built)} images!')
+        )
@@ -0,0 +1,198 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from myapp.caching import bump_catalog_version, invalidate_home_context
+from myapp.fleet import upsert_vehicles
+from myapp.models import Booking, Category, Feature, Review, Vehicle
+
+# vehicle_type -> (share of the fleet, brands/models, seat choices, median price per day)
+FLEET_MIX = {
+    'bike': (0.40, {'Honda': ['Activa', 'Shine'], 'Bajaj': ['Pulsar', 'Dominar'], 'Royal Enfield': ['Classic 350', 'Himalayan'],
+                    'TVS': ['Apache', 'Jupiter'], 'KTM': ['Duke 390']}, [1, 2], 700),
+    'car': (0.45, {'Maruti Suzuki': ['Swift', 'Baleno', 'Ertiga'], 'Hyundai': ['i20', 'Creta'], 'Tata': ['Nexon', 'Punch'],
+                   'Mahindra': ['XUV700', 'Thar'], 'Toyota': ['Innova Crysta', 'Fortuner']}, [4, 5, 5, 5, 7], 2200),
+    'traveller': (0.15, {'Force': ['Traveller'], 'Tata': ['Winger'], 'Mercedes-Benz': ['Sprinter']}, [12, 14, 17, 20], 5000),
+}
+FUEL_TYPES = [('Petrol', 0.55), ('Diesel', 0.30), ('Electric', 0.10), ('CNG', 0.05)]
+COLORS = ['White', 'Black', 'Silver', 'Red', 'Blue', 'Grey']
+FEATURES = [
+    'AC', 'GPS', 'Bluetooth', 'ABS', 'Airbags', 'Climate control', 'Entertainment system', 'Reverse camera',
+    'Sunroof', 'Cruise control', 'USB charging', 'LED lighting', 'Fuel efficient', 'Spacious interior',
+]
+# Booking status -> weight among bookings that ended in the past
+PAST_STATUSES = [('completed', 0.8), ('cancelled', 0.2)]
+FUTURE_STATUSES = [('confirmed', 0.6), ('pending', 0.3), ('cancelled', 0.1)]
+# Ratings skew positive, as they do in practice
+RATING_WEIGHTS = [(5, 0.42), (4, 0.33), (3, 0.14), (2, 0.06), (1, 0.05)]
+
+
+def weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, vehicles, bookings and reviews for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--vehicles', type=int, default=5000)
+        parser.add_argument('--bookings', type=int, default=50000)
+        parser.add_argument('--reviews', type=int, default=10000,
+                            help='Upper bound; at most one review per user and vehicle, from completed bookings')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Random seed, so runs are reproducible')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
+
+        users = self.create_users(options['users'])
+        vehicles = self.create_vehicles(options['vehicles'])
+        completed = self.create_bookings(options['bookings'], users, vehicles)
+        reviews = self.create_reviews(options['reviews'], completed)
+
+        # Bulk inserts skip the signals that keep these up to date
+        Vehicle.objects.rebuild_rating_aggregates()
+        invalidate_home_context()
+        bump_catalog_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully generated {len(users)} users, {len(vehicles)} vehicles, '
+                f'{self.booking_count} bookings and {reviews} reviews in {time.monotonic() - started:.1f}s!'
+            )
+        )
+
+    def create_users(self, count):
+        prefix = f'demo{self.rng.randrange(10 ** 6):06d}_'
+        password = make_password('demo-pass-123')  # hashed once, not per user
+        User.objects.bulk_create(
+            [User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', password=password) for i in range(count)],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.stdout.write(f'Created {count} users')
+        return list(User.objects.filter(username__startswith=prefix).values_list('pk', flat=True))
+
+    def create_vehicles(self, count):
+        categories = {category.name: category.pk for category in Category.objects.all()}
+        for name, icon in [('Economy', 'fas fa-car'), ('Premium', 'fas fa-star'), ('Family', 'fas fa-users')]:
+            if name not in categories:
+                categories[name] = Category.objects.create(name=name, description=f'{name} vehicles', icon_class=icon).pk
+        catalog = {feature.slug: feature for feature in Feature.objects.all()}
+        types = [(vehicle_type, mix[0]) for vehicle_type, mix in FLEET_MIX.items()]
+
+        batch = []
+        for i in range(count):
+            vehicle_type = weighted(self.rng, types)
+            _, brands, seat_choices, median_price = FLEET_MIX[vehicle_type]
+            brand = self.rng.choice(sorted(brands))
+            model = self.rng.choice(brands[brand])
+            # Log-normal prices: most near the median, a long premium tail
+            price = Decimal(round(median_price * self.rng.lognormvariate(0, 0.35), -1))
+            category = 'Premium' if price > median_price * 1.4 else ('Family' if vehicle_type == 'traveller' else 'Economy')
+            batch.append(Vehicle(
+                fleet_code=f'DEMO-{i:07d}',
+                name=f'{brand} {model} #{i}',
+                category_id=categories[category],
+                vehicle_type=vehicle_type,
+                brand=brand,
+                model=model,
+                year=self.rng.randint(2016, 2025),
+                fuel_type=weighted(self.rng, FUEL_TYPES),
+                transmission='Automatic' if self.rng.random() < 0.3 else 'Manual',
+                seats=self.rng.choice(seat_choices),
+                price_per_day=price,
+                price_per_hour=(price / 10).quantize(Decimal('0.01')),
+                description=f'{brand} {model} in good condition, serviced regularly.',
+                features=', '.join(self.rng.sample(FEATURES, self.rng.randint(2, 6))),
+                mileage=f'{self.rng.randint(8, 60)} km/l',
+                color=self.rng.choice(COLORS),
+                is_available=self.rng.random() < 0.92,
+            ))
+            if len(batch) >= self.batch_size:
+                upsert_vehicles(batch, catalog)
+                batch = []
+        if batch:
+            upsert_vehicles(batch, catalog)
+        self.stdout.write(f'Created {count} vehicles')
+        return list(
+            Vehicle.objects.filter(fleet_code__startswith='DEMO-').order_by('pk').values_list('pk', 'price_per_day')[:count]
+        )
+
+    def create_bookings(self, count, users, vehicles):
+        """
+        Bookings follow a Zipf-like popularity curve over vehicles and never
+        overlap on the same vehicle. Returns (user, vehicle) pairs of
+        completed bookings, for reviews.
+        """
+        self.booking_count = 0
+        if not users or not vehicles:
+            return []
+        now = timezone.now()
+        weights = [1 / (rank + 1) ** 1.1 for rank in range(len(vehicles))]
+        # Each vehicle's calendar starts a year ago, or after its last booking,
+        # and only moves forward
+        next_free = {pk: now - timedelta(days=365) for pk, _ in vehicles}
+        next_free.update(
+            Booking.objects.filter(vehicle_id__in=next_free).values_list('vehicle_id').annotate(Max('end_date'))
+        )
+        completed = []
+        batch = []
+        for vehicle_pk, price in self.rng.choices(vehicles, weights, k=count):
+            start = next_free[vehicle_pk] + timedelta(hours=self.rng.randint(2, 24 * 10))
+            days = min(int(self.rng.expovariate(1 / 2.5)) + 1, 21)
+            end = start + timedelta(days=days)
+            next_free[vehicle_pk] = end
+
+            if end < now:
+                status = weighted(self.rng, PAST_STATUSES)
+            elif start <= now:
+                status = 'active'
+            else:
+                status = weighted(self.rng, FUTURE_STATUSES)
+            user_pk = self.rng.choice(users)
+            if status == 'completed':
+                completed.append((user_pk, vehicle_pk))
+            batch.append(Booking(
+                user_id=user_pk,
+                vehicle_id=vehicle_pk,
+                start_date=start,
+                end_date=end,
+                pickup_location='City Center',
+                return_location='City Center',
+                total_amount=price * days,
+                status=status,
+            ))
+            if len(batch) >= self.batch_size:
+                self.booking_count += len(Booking.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            self.booking_count += len(Booking.objects.bulk_create(batch))
+        self.stdout.write(f'Created {self.booking_count} bookings')
+        return completed
+
+    def create_reviews(self, count, completed):
+        pairs = list(dict.fromkeys(completed))  # one review per user and vehicle
+        self.rng.shuffle(pairs)
+        existing = set(Review.objects.values_list('user_id', 'vehicle_id'))
+        reviews = [
+            Review(user_id=user_pk, vehicle_id=vehicle_pk, rating=weighted(self.rng, RATING_WEIGHTS),
+                   comment='Smooth rental, vehicle as described.')
+            for user_pk, vehicle_pk in pairs if (user_pk, vehicle_pk) not in existing
+        ][:count]
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(reviews)} reviews')
+        return len(reviews)
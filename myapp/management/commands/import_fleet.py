@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from myapp.caching import bump_catalog_version, invalidate_home_context
+from myapp.fleet import upsert_vehicles
+from myapp.models import Category, Feature, Vehicle
+
+REQUIRED_FIELDS = [
+    'fleet_code', 'name', 'category', 'vehicle_type', 'brand', 'model', 'year', 'fuel_type',
+    'transmission', 'seats', 'price_per_day', 'price_per_hour', 'description', 'features', 'mileage', 'color',
+]
+
+VEHICLE_TYPES = {value for value, _ in Vehicle.VEHICLE_TYPES}
+# Column limits (max_length, max_digits, integer range) that the database
+# would otherwise enforce by failing the whole batch
+CHECKED_FIELDS = [Vehicle._meta.get_field(field) for field in REQUIRED_FIELDS if field != 'category']
+CATEGORY_NAME_LENGTH = Category._meta.get_field('name').max_length
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (line number, dict) without loading the whole file. A line that
+    can't be read yields a RowError in place of the dict.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        try:
+            reader.fieldnames
+        except csv.Error as e:
+            yield 1, RowError(f'invalid CSV header: {e}')
+            return
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # The reader hasn't counted the line it failed on yet
+                yield reader.line_num + 1, RowError(f'invalid CSV: {e}')
+                continue
+            yield reader.line_num, row
+    else:
+        for line_num, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_num, RowError(f'invalid JSON: {e}')
+                    continue
+                if not isinstance(row, dict):
+                    yield line_num, RowError('expected a JSON object')
+                    continue
+                yield line_num, row
+
+
+def parse_bool(value, default=True):
+    """Anything but an explicit false token is true; a blank or missing value is ``default``"""
+    if isinstance(value, bool):
+        return value
+    if value is None or not str(value).strip():
+        return default
+    return str(value).strip().lower() not in ('0', 'false', 'no', 'n')
+
+
+class Command(BaseCommand):
+    help = 'Upsert vehicles from a CSV or JSON Lines file, keyed by fleet_code'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or .jsonl file, or '-' for stdin")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Input format; guessed from the file extension by default')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of vehicles upserted per transaction')
+        parser.add_argument('--create-categories', action='store_true',
+                            help='Create categories that do not exist yet instead of skipping the row')
+        parser.add_argument('--max-errors', type=int, default=20,
+                            help='Number of rejected rows to report individually')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        if path == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+        else:
+            try:
+                stream = open(path, encoding='utf-8', newline='')
+            except OSError as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+
+        # Everything the rows refer to is looked up in memory, not per row
+        self.categories = {category.name.lower(): category.pk for category in Category.objects.all()}
+        self.features = {feature.slug: feature for feature in Feature.objects.all()}
+        self.create_categories = options['create_categories']
+
+        batch_size = options['batch_size']
+        imported = rejected = 0
+        batch = []
+        started = time.monotonic()
+        with stream:
+            for line_num, row in read_rows(stream, fmt):
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    batch.append(self.build_vehicle(row))
+                except RowError as e:
+                    rejected += 1
+                    if rejected <= options['max_errors']:
+                        self.stdout.write(self.style.WARNING(f'Line {line_num}: {e}'))
+                    continue
+
+                if len(batch) >= batch_size:
+                    imported += upsert_vehicles(batch, self.features)
+                    batch = []
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f'{imported} vehicles imported ({imported / elapsed:.0f} rows/s)')
+
+        if batch:
+            imported += upsert_vehicles(batch, self.features)
+
+        invalidate_home_context()
+        bump_catalog_version()
+
+        elapsed = time.monotonic() - started
+        rate = imported / elapsed if elapsed else imported
+        if rejected:
+            self.stdout.write(self.style.WARNING(f'Rejected {rejected} rows'))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully imported {imported} vehicles in {elapsed:.1f}s ({rate:.0f} rows/s)!'
+            )
+        )
+
+    def category_id(self, name):
+        key = name.strip().lower()
+        if key not in self.categories:
+            if not self.create_categories:
+                raise RowError(f'unknown category "{name}"')
+            if len(name.strip()) > CATEGORY_NAME_LENGTH:
+                raise RowError(f'category: name is longer than {CATEGORY_NAME_LENGTH} characters')
+            category = Category.objects.create(name=name.strip(), description='', icon_class='fas fa-car')
+            self.categories[key] = category.pk
+        return self.categories[key]
+
+    def build_vehicle(self, row):
+        """Validate one input row into an unsaved Vehicle; raises RowError"""
+        missing = [field for field in REQUIRED_FIELDS if row.get(field) in (None, '')]
+        if missing:
+            raise RowError(f'missing {", ".join(missing)}')
+        if row['vehicle_type'] not in VEHICLE_TYPES:
+            raise RowError(f'invalid vehicle_type "{row["vehicle_type"]}"')
+        try:
+            year = int(row['year'])
+            seats = int(row['seats'])
+            price_per_day = Decimal(str(row['price_per_day']))
+            price_per_hour = Decimal(str(row['price_per_hour']))
+        except (ValueError, InvalidOperation):
+            raise RowError('year, seats and prices must be numbers')
+        if price_per_day < 0 or price_per_hour < 0:
+            raise RowError('prices cannot be negative')
+
+        vehicle = Vehicle(
+            fleet_code=str(row['fleet_code']).strip(),
+            name=row['name'],
+            vehicle_type=row['vehicle_type'],
+            brand=row['brand'],
+            model=row['model'],
+            year=year,
+            fuel_type=row['fuel_type'],
+            transmission=row['transmission'],
+            seats=seats,
+            price_per_day=price_per_day,
+            price_per_hour=price_per_hour,
+            description=row['description'],
+            features=row['features'],
+            mileage=row['mileage'],
+            color=row['color'],
+            is_available=parse_bool(row.get('is_available')),
+        )
+        for field in CHECKED_FIELDS:
+            try:
+                field.run_validators(getattr(vehicle, field.attname))
+            except ValidationError as e:
+                raise RowError(f'{field.name}: {" ".join(e.messages)}')
+        # Last, so a rejected row never creates its category
+        vehicle.category_id = self.category_id(row['category'])
+        return vehicle
@@ -0,0 +1,44 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = ('Delete expired rows from django_session in small batches, each in its own short '
+            'transaction, so the table is never locked for long (unlike clearsessions)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='Seconds to pause between batches, to leave room for other writers')
+        parser.add_argument('--max-batches', type=int,
+                            help='Stop after this many batches; run again to continue')
+
+    def handle(self, *args, **options):
+        # Sessions expiring while the purge runs are left for the next run
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by('expire_date')
+        started = time.monotonic()
+        deleted = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            with transaction.atomic():
+                # Seeks the expire_date index; deleting by key keeps each statement small
+                keys = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+                if keys:
+                    deleted += Session.objects.filter(pk__in=keys).delete()[0]
+            batches += 1
+            if len(keys) < options['batch_size']:
+                break
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Deleted {deleted} sessions so far')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully purged {deleted} expired sessions in {batches} batches '
+            f'({deleted / elapsed if elapsed else 0:.0f} rows/s)!'
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from myapp.models import Vehicle
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized rating aggregates stored on Vehicle'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of vehicles updated per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = list(Vehicle.objects.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+        
+        # Each batch is a single set-based UPDATE over a primary key range
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i:i + batch_size]
+            with transaction.atomic():
+                updated += Vehicle.objects.filter(
+                    pk__gte=chunk[0], pk__lte=chunk[-1]
+                ).rebuild_rating_aggregates()
+            self.stdout.write(f'Rebuilt ratings for {updated}/{len(ids)} vehicles')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt ratings for {updated} vehicles!')
+        )
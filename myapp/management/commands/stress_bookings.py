@@ -0,0 +1,113 @@
+import json
+import multiprocessing
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.utils import timezone
+from myapp.bookings import BookingConflict, reserve
+from myapp.models import Booking, Vehicle
+
+# Bookings made by a run are tagged with this pickup location so they can be
+# told apart from real ones and removed afterwards
+MARKER = 'stress-test {}'
+
+
+def attempt_bookings(job):
+    """Worker: try to book random overlapping slots, return outcome counts"""
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+    seed, attempts, window_hours, user_id, vehicle_ids, window_start, marker = job
+    rng = random.Random(seed)
+    outcomes = {'created': 0, 'conflicts': 0, 'errors': 0}
+    for _ in range(attempts):
+        start = window_start + timedelta(hours=rng.randrange(window_hours))
+        booking = Booking(
+            user_id=user_id,
+            vehicle_id=rng.choice(vehicle_ids),
+            start_date=start,
+            end_date=start + timedelta(hours=rng.randint(1, 48)),
+            pickup_location=marker,
+            return_location=marker,
+        )
+        try:
+            reserve(booking)
+            outcomes['created'] += 1
+        except BookingConflict:
+            outcomes['conflicts'] += 1
+        except OperationalError:
+            # e.g. SQLite's "database is locked" once the busy timeout runs out
+            outcomes['errors'] += 1
+    connections.close_all()
+    return outcomes
+
+
+class Command(BaseCommand):
+    help = ('Book the same few vehicles from several processes at once, check that no two '
+            'blocking bookings overlap, and report bookings/s under contention as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8)
+        parser.add_argument('--attempts', type=int, default=200,
+                            help='Booking attempts per process')
+        parser.add_argument('--vehicles', type=int, default=3,
+                            help='How many vehicles all processes compete for')
+        parser.add_argument('--window-hours', type=int, default=24 * 30,
+                            help='Start times are spread over this many hours; smaller means more contention')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true',
+                            help='Keep the bookings instead of deleting them afterwards')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor == 'sqlite' and connections['default'].is_in_memory_db():
+            raise CommandError('Needs a database the worker processes can share, not in-memory SQLite')
+        user = User.objects.order_by('pk').first()
+        vehicle_ids = list(
+            Vehicle.objects.filter(is_available=True).order_by('pk').values_list('pk', flat=True)[:options['vehicles']]
+        )
+        if not user or not vehicle_ids:
+            raise CommandError('Needs at least one user and one available vehicle; run generate_demo_data first')
+
+        marker = MARKER.format(int(time.time()))
+        # Far enough ahead not to collide with real bookings
+        window_start = (timezone.now() + timedelta(days=3650)).replace(minute=0, second=0, microsecond=0)
+        jobs = [
+            (options['seed'] + worker, options['attempts'], options['window_hours'],
+             user.pk, vehicle_ids, window_start, marker)
+            for worker in range(options['processes'])
+        ]
+
+        connections.close_all()
+        started = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(options['processes']) as pool:
+            results = pool.map(attempt_bookings, jobs)
+        elapsed = time.perf_counter() - started
+
+        totals = {key: sum(result[key] for result in results) for key in ('created', 'conflicts', 'errors')}
+        bookings = Booking.objects.filter(pickup_location=marker)
+        double_booked = bookings.double_booked().count()
+        report = {
+            'database': connections['default'].vendor,
+            'processes': options['processes'],
+            'vehicles': len(vehicle_ids),
+            'attempts': options['processes'] * options['attempts'],
+            **totals,
+            'saved': bookings.count(),
+            'double_booked': double_booked,
+            'seconds': round(elapsed, 2),
+            'attempts_per_second': round(options['processes'] * options['attempts'] / elapsed, 1),
+            'bookings_per_second': round(totals['created'] / elapsed, 1),
+        }
+        if not options['keep']:
+            bookings.delete()
+        self.stdout.write(json.dumps(report, indent=2))
+
+        if double_booked:
+            raise CommandError(f'{double_booked} bookings overlap another booking of the same vehicle')
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully created {totals["created"]} bookings from {options["processes"]} processes '
+            f'with no double bookings!'
+        ))
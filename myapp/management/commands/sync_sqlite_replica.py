@@ -0,0 +1,34 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = ('Copy the primary SQLite database over the SQLite replica files, to try replica '
+            'routing locally; run it again whenever the "replica" should catch up')
+
+    def add_arguments(self, parser):
+        parser.add_argument('aliases', nargs='*',
+                            help='Replica aliases to refresh; defaults to all of DATABASE_REPLICAS')
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or settings.DATABASE_REPLICAS
+        if not aliases:
+            raise CommandError('No replicas configured; set DATABASE_REPLICA_URLS')
+        primary = connections[DEFAULT_DB_ALIAS]
+        for alias in [DEFAULT_DB_ALIAS, *aliases]:
+            if alias not in settings.DATABASES or connections[alias].vendor != 'sqlite':
+                raise CommandError(f'{alias!r} is not an SQLite database')
+
+        primary.ensure_connection()
+        for alias in aliases:
+            connections[alias].close()
+            # The online backup API gives a consistent copy even while the
+            # primary is being written to
+            with sqlite3.connect(settings.DATABASES[alias]['NAME']) as target:
+                primary.connection.backup(target)
+            self.stdout.write(f'Copied {primary.settings_dict["NAME"]} to {alias}')
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully synced {len(aliases)} replica(s)!'))
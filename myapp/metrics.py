@@ -0,0 +1,217 @@
+"""
+Per-view request metrics in Prometheus text format.
+
+MetricsMiddleware records, per resolved URL name, request latency, SQL query
+count and time, and response size. Each process aggregates in memory; when
+settings.METRICS_DIR is set, processes also write their totals there so any
+worker can serve the sum over all of them at /metrics/ (the same idea as the
+prometheus_client multiprocess mode, without the dependency).
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HISTOGRAMS = {
+    'django_http_request_duration_seconds': ('Request latency by view', LATENCY_BUCKETS),
+    'django_db_queries_per_request': ('SQL queries per request by view', QUERY_COUNT_BUCKETS),
+    'django_http_response_size_bytes': ('Response body size by view', SIZE_BUCKETS),
+}
+COUNTERS = {
+    'django_http_requests_total': 'Requests by view, method and status',
+    'django_db_queries_total': 'SQL queries executed by view',
+    'django_db_query_duration_seconds_total': 'Time spent in SQL by view',
+}
+
+UNRESOLVED = '<unresolved>'
+# Anything else is reported as "other" so clients can't inflate label cardinality
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+
+class MetricsStore:
+    """Thread-safe in-process totals, optionally mirrored to a per-process file"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            # name -> {labels tuple: value}
+            self.counters = defaultdict(lambda: defaultdict(float))
+            # name -> {labels tuple: [bucket counts..., +Inf count, sum]}
+            self.histograms = defaultdict(dict)
+            self.last_flush = 0.0
+
+    def inc(self, name, labels, amount=1):
+        with self.lock:
+            self.counters[name][labels] += amount
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        with self.lock:
+            series = self.histograms[name].setdefault(labels, [0] * (len(buckets) + 2))
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': {name: [[list(labels), value] for labels, value in series.items()]
+                             for name, series in self.counters.items()},
+                'histograms': {name: [[list(labels), list(values)] for labels, values in series.items()]
+                               for name, series in self.histograms.items()},
+            }
+
+    def flush(self, directory, force=False):
+        """Atomically rewrite this process's file, at most once per METRICS_FLUSH_INTERVAL"""
+        now = time.monotonic()
+        if not force and now - self.last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp_path, os.path.join(directory, f'{os.getpid()}.json'))
+
+
+store = MetricsStore()
+
+
+def collect():
+    """Merged snapshot of every process's totals (or just this one's)"""
+    directory = settings.METRICS_DIR
+    if not directory:
+        return [store.snapshot()]
+    store.flush(directory, force=True)
+    snapshots = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(directory, name)) as fh:
+                    snapshots.append(json.load(fh))
+            except (OSError, ValueError):
+                continue  # a worker is mid-write or the file vanished
+    return snapshots
+
+
+def _format_labels(keys, values):
+    pairs = []
+    for key, value in zip(keys, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+    counters = defaultdict(lambda: defaultdict(float))
+    histograms = defaultdict(dict)
+    for snapshot in collect():
+        for name, series in snapshot['counters'].items():
+            for labels, value in series:
+                counters[name][tuple(labels)] += value
+        for name, series in snapshot['histograms'].items():
+            for labels, values in series:
+                merged = histograms[name].setdefault(tuple(labels), [0] * len(values))
+                for i, value in enumerate(values):
+                    merged[i] += value
+
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        label_keys = ('view', 'method', 'status') if name == 'django_http_requests_total' else ('view',)
+        for labels, value in sorted(counters[name].items()):
+            lines.append(f'{name}{_format_labels(label_keys, labels)} {value:g}')
+
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for labels, values in sorted(histograms[name].items()):
+            for bound, count in zip((*buckets, '+Inf'), values):
+                le = bound if bound == '+Inf' else f'{bound:g}'
+                lines.append(f'{name}_bucket{_format_labels(("view", "le"), (*labels, le))} {count:g}')
+            lines.append(f'{name}_count{_format_labels(("view",), labels)} {values[-2]:g}')
+            lines.append(f'{name}_sum{_format_labels(("view",), labels)} {values[-1]:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class QueryTimer:
+    """connection.execute_wrapper hook counting queries and their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """Record latency, SQL and response size per resolved URL name"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        # The request's connections are shared with the thread its ORM calls run in
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = await self.get_response(request)
+        self.record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, timer, elapsed):
+        match = request.resolver_match
+        view = (match.view_name if match else None) or UNRESOLVED
+        method = request.method if request.method in METHODS else 'other'
+        store.inc('django_http_requests_total', (view, method, str(response.status_code)))
+        store.inc('django_db_queries_total', (view,), timer.count)
+        store.inc('django_db_query_duration_seconds_total', (view,), timer.duration)
+        store.observe('django_http_request_duration_seconds', (view,), elapsed)
+        store.observe('django_db_queries_per_request', (view,), timer.count)
+        if not response.streaming:
+            store.observe('django_http_response_size_bytes', (view,), len(response.content))
+
+        if settings.METRICS_DIR:
+            store.flush(settings.METRICS_DIR)
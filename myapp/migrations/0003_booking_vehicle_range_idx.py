@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0002_alter_userprofile_profile_picture_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['vehicle', 'start_date', 'end_date'], name='booking_vehicle_range_idx'),
+        ),
+    ]
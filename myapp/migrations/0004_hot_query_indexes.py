@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0003_booking_vehicle_range_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created_at'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['vehicle', '-created_at'], name='review_vehicle_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-created_at'], name='vehicle_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['vehicle_type', '-created_at'], name='vehicle_type_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['category', '-created_at'], name='vehicle_category_avail_idx'),
+        ),
+    ]
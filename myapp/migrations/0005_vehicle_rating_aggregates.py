@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:54
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    Vehicle = apps.get_model('myapp', 'Vehicle')
+    Review = apps.get_model('myapp', 'Review')
+    reviews = Review.objects.filter(vehicle=OuterRef('pk')).order_by().values('vehicle')
+    Vehicle.objects.update(
+        review_count=Coalesce(Subquery(reviews.annotate(c=Count('pk')).values('c')), 0),
+        rating_sum=Coalesce(Subquery(reviews.annotate(s=Sum('rating')).values('s')), 0),
+        avg_rating=Coalesce(Subquery(reviews.annotate(a=Avg('rating')).values('a')), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='avg_rating',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-avg_rating', '-review_count'], name='vehicle_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0005_vehicle_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='vehicle_available_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='vehicle_type_available_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='vehicle_category_avail_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='vehicle_rating_idx',
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-created_at', '-id'], name='vehicle_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['vehicle_type', '-created_at', '-id'], name='vehicle_type_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['category', '-created_at', '-id'], name='vehicle_category_avail_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['price_per_day', 'id'], name='vehicle_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-avg_rating', '-review_count', '-id'], name='vehicle_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0006_keyset_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='has_image_derivatives',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from myapp.search import install_fts, uninstall_fts
+
+
+def create_search_index(apps, schema_editor):
+    install_fts(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_fts(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0009_vehicle_image_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:05
+
+from django.db import migrations, models
+
+from myapp.features import mask_for_bits, next_free_bit, parse_features
+
+
+def populate_feature_catalog(apps, schema_editor):
+    """Parse every vehicle's comma-separated features into the catalog"""
+    Feature = apps.get_model('myapp', 'Feature')
+    Vehicle = apps.get_model('myapp', 'Vehicle')
+    catalog = {}
+    vehicles = []
+    for vehicle in Vehicle.objects.only('id', 'features').iterator():
+        bits = []
+        tags = []
+        for slug, name in parse_features(vehicle.features):
+            if slug not in catalog:
+                catalog[slug] = Feature.objects.create(
+                    slug=slug, name=name, bit=next_free_bit(f.bit for f in catalog.values())
+                )
+            bits.append(catalog[slug].bit)
+            tags.append(catalog[slug])
+        vehicle.feature_mask = mask_for_bits(bits)
+        vehicle.feature_tags.set(tags)
+        vehicles.append(vehicle)
+    Vehicle.objects.bulk_update(vehicles, ['feature_mask'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0010_vehicle_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+                ('bit', models.PositiveSmallIntegerField(blank=True, editable=False, null=True, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='feature_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='vehicle',
+            name='feature_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='vehicles', to='myapp.feature'),
+        ),
+        migrations.RunPython(populate_feature_catalog, migrations.RunPython.noop),
+    ]
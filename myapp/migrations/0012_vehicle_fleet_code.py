@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_feature_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='fleet_code',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0012_vehicle_fleet_code'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['updated_at'], name='vehicle_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+from myapp.bookings import install_overlap_guard, uninstall_overlap_guard
+
+
+def create_overlap_guard(apps, schema_editor):
+    install_overlap_guard(schema_editor.connection)
+
+
+def drop_overlap_guard(apps, schema_editor):
+    uninstall_overlap_guard(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0013_vehicle_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_overlap_guard, drop_overlap_guard),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:05
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def expect_renamed_derivatives(apps, schema_editor):
+    # Derivative names now keep the source extension, so existing ones are
+    # no longer found. Templates show the original until
+    # "manage.py build_image_derivatives" has rebuilt them; bumping
+    # updated_at retires cached cards that link the old names.
+    Vehicle = apps.get_model('myapp', 'Vehicle')
+    Vehicle.objects.filter(has_image_derivatives=True).update(has_image_derivatives=False, updated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0016_category_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(expect_renamed_derivatives, migrations.RunPython.noop),
+    ]
@@ -2,10 +2,22 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 from decimal import Decimal
 from datetime import datetime, timedelta
+import logging
 import os
-from PIL import Image
+from .features import mask_for_bits, next_free_bit, parse_features
+from .pricing import billable_units, quote
+from .images import (
+    DERIVATIVE_WIDTHS, delete_derivatives, derivative_name, generate_derivatives, validate_image_upload,
+)
+from .search import FTS_COLUMNS, FTS_TABLE, fts_match_query, search_terms
+
+logger = logging.getLogger(__name__)
 
 def validate_image_file(value):
     """Custom validator for image files"""
@@ -18,28 +30,7 @@ def validate_image_file(value):
             f'Unsupported file extension. Allowed extensions are: {", ".join(valid_extensions)}'
         )
     
-    # Check file size (max 10MB)
-    if value.size > 10 * 1024 * 1024:  # 10MB in bytes
-        raise ValidationError('File size cannot exceed 10MB.')
-    
-    # Validate image format using PIL
-    try:
-        img = Image.open(value)
-        img.verify()  # Verify it's actually an image
-        
-        # Reset file pointer for future use
-        value.seek(0)
-        
-        # Check dimensions (optional - you can adjust these values)
-        img = Image.open(value)
-        if img.width > 4000 or img.height > 4000:
-            raise ValidationError('Image dimensions cannot exceed 4000x4000 pixels.')
-        
-        # Reset file pointer again
-        value.seek(0)
-        
-    except Exception as e:
-        raise ValidationError(f'Invalid image file: {str(e)}')
+    return validate_image_upload(value, ('JPEG', 'PNG', 'WEBP'), 'File must be a valid JPG, PNG or WebP image.')
 
 def validate_jpg_png_only(value):
     """Validator that only allows JPG/JPEG and PNG files"""
@@ -47,30 +38,176 @@ def validate_jpg_png_only(value):
     if ext not in ['.jpg', '.jpeg', '.png']:
         raise ValidationError('Only JPG/JPEG and PNG files are allowed.')
     
-    # Check file size (max 10MB)
-    if value.size > 10 * 1024 * 1024:  # 10MB in bytes
-        raise ValidationError('File size cannot exceed 10MB.')
+    return validate_image_upload(value, ('JPEG', 'PNG'), 'File must be a valid JPG/JPEG or PNG image.')
+
+class VehicleQuerySet(models.QuerySet):
+    def available_between(self, start, end):
+        """Vehicles with no blocking booking overlapping [start, end)"""
+        return self.filter(
+            ~models.Exists(
+                Booking.objects.blocking().overlapping(start, end).filter(vehicle=models.OuterRef('pk'))
+            )
+        )
+    
+    def rebuild_rating_aggregates(self):
+        """Recompute review_count, rating_sum and avg_rating from the Review table"""
+        reviews = Review.objects.filter(vehicle=models.OuterRef('pk')).order_by().values('vehicle')
+        return self.update(
+            review_count=Coalesce(models.Subquery(reviews.annotate(c=models.Count('pk')).values('c')), 0),
+            rating_sum=Coalesce(models.Subquery(reviews.annotate(s=models.Sum('rating')).values('s')), 0),
+            avg_rating=Coalesce(models.Subquery(reviews.annotate(a=models.Avg('rating')).values('a')), 0.0),
+            updated_at=timezone.now(),
+        )
     
-    # Validate image format using PIL
-    try:
-        img = Image.open(value)
-        if img.format not in ['JPEG', 'JPG', 'PNG']:
-            raise ValidationError('File must be a valid JPG/JPEG or PNG image.')
+    def search(self, text):
+        """
+        Vehicles matching every word of ``text``, annotated with search_rank
+        (lower is better). Uses the FTS5 index on SQLite and LIKE elsewhere.
+        """
+        match = fts_match_query(text)
+        if not match:
+            return self
+        if connections[self.db].vendor == 'sqlite':
+            return self.extra(
+                tables=[FTS_TABLE],
+                where=[f'{FTS_TABLE}.rowid = {Vehicle._meta.db_table}.id', f'{FTS_TABLE} MATCH %s'],
+                params=[match],
+            ).annotate(search_rank=RawSQL(f'{FTS_TABLE}.rank', (), output_field=models.FloatField()))
         
-        # Check dimensions
-        if img.width > 4000 or img.height > 4000:
-            raise ValidationError('Image dimensions cannot exceed 4000x4000 pixels.')
-        
-        # Reset file pointer
-        value.seek(0)
+        queryset = self
+        for term in search_terms(text):
+            any_column = models.Q()
+            for column in FTS_COLUMNS:
+                any_column |= models.Q(**{f'{column}__icontains': term})
+            queryset = queryset.filter(any_column)
+        return queryset.annotate(search_rank=models.Value(0.0, output_field=models.FloatField()))
+    
+    def with_features(self, features):
+        """Vehicles that have every one of ``features``, tested on feature_mask"""
+        queryset = self
+        mask = mask_for_bits(feature.bit for feature in features)
+        if mask:
+            queryset = queryset.alias(
+                matched_features=models.F('feature_mask').bitand(mask)
+            ).filter(matched_features=mask)
+        # Features beyond the last bit position are rare; join for those
+        for feature in features:
+            if feature.bit is None:
+                queryset = queryset.filter(feature_tags=feature)
+        return queryset
+    
+    def facet_counts(self):
+        """
+        Result counts per vehicle type, brand, fuel type, transmission,
+        category and minimum seats, from a single GROUP BY over every facet
+        column at once.
+        """
+        rows = (
+            self.order_by()
+            .values('vehicle_type', 'brand', 'fuel_type', 'transmission', 'category_id', 'category__name', 'seats')
+            .annotate(total=models.Count('pk'))
+        )
+        counters = {name: {} for name in ('vehicle_type', 'brand', 'fuel_type', 'transmission', 'category')}
+        labels = {'vehicle_type': dict(Vehicle.VEHICLE_TYPES), 'category': {}}
+        seats = {}
+        for row in rows:
+            total = row['total']
+            for name in ('vehicle_type', 'brand', 'fuel_type', 'transmission'):
+                counters[name][row[name]] = counters[name].get(row[name], 0) + total
+            counters['category'][row['category_id']] = counters['category'].get(row['category_id'], 0) + total
+            labels['category'][row['category_id']] = row['category__name']
+            seats[row['seats']] = seats.get(row['seats'], 0) + total
         
-    except Exception as e:
-        raise ValidationError(f'Invalid image file: {str(e)}')
+        facets = {
+            name: sorted(
+                (
+                    {'value': value, 'label': labels.get(name, {}).get(value, value), 'count': count}
+                    for value, count in counts.items()
+                ),
+                key=lambda facet: (-facet['count'], str(facet['label'])),
+            )
+            for name, counts in counters.items()
+        }
+        # Seat bands are cumulative, matching the "Min Seats" filter
+        facets['seats'] = [
+            {'value': minimum, 'label': f'{minimum}+ seats', 'count': count}
+            for minimum, count in (
+                (minimum, sum(n for value, n in seats.items() if value >= minimum))
+                for minimum in Vehicle.SEAT_FACETS
+            )
+            if count
+        ]
+        return facets
+
+class BookingRecordQuerySet(models.QuerySet):
+    def stats(self):
+        """Total, active, pending and completed counts in a single aggregate query"""
+        return self.aggregate(
+            total=models.Count('pk'),
+            active=models.Count('pk', filter=models.Q(status__in=BookingRecord.BLOCKING_STATUSES)),
+            pending=models.Count('pk', filter=models.Q(status='pending')),
+            completed=models.Count('pk', filter=models.Q(status='completed')),
+        )
+
+class BookingQuerySet(BookingRecordQuerySet):
+    def blocking(self):
+        """Bookings that hold the vehicle for their date range"""
+        return self.filter(status__in=Booking.BLOCKING_STATUSES)
+    
+    def overlapping(self, start, end):
+        """Bookings whose interval intersects [start, end)"""
+        return self.filter(start_date__lt=end, end_date__gt=start)
+    
+    def double_booked(self):
+        """Blocking bookings that overlap another blocking booking of the same vehicle"""
+        others = Booking.objects.using(self.db).blocking().filter(
+            vehicle_id=models.OuterRef('vehicle_id'),
+            start_date__lt=models.OuterRef('end_date'),
+            end_date__gt=models.OuterRef('start_date'),
+        ).exclude(pk=models.OuterRef('pk'))
+        return self.blocking().filter(models.Exists(others))
+
+class FeatureQuerySet(models.QuerySet):
+    def resolve(self, text):
+        """Features named in a comma-separated string, created where missing"""
+        pairs = parse_features(text)
+        catalog = self.resolve_pairs(pairs)
+        return [catalog[slug] for slug, _ in pairs]
+    
+    def resolve_pairs(self, pairs):
+        """{slug: Feature} for (slug, name) pairs, with one lookup for the existing ones"""
+        catalog = {feature.slug: feature for feature in self.filter(slug__in=[slug for slug, _ in pairs])}
+        for slug, name in pairs:
+            if slug in catalog:
+                continue
+            try:
+                with transaction.atomic():
+                    bit = next_free_bit(self.exclude(bit=None).values_list('bit', flat=True))
+                    catalog[slug] = self.create(slug=slug, name=name, bit=bit)
+            except IntegrityError:
+                # Lost a race for the slug or the bit; the slug may now exist
+                catalog[slug], _ = self.get_or_create(slug=slug, defaults={'name': name})
+        return catalog
+
+class Feature(models.Model):
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)
+    # Position in Vehicle.feature_mask; None once all 63 bits are in use
+    bit = models.PositiveSmallIntegerField(null=True, blank=True, unique=True, editable=False)
+    
+    objects = FeatureQuerySet.as_manager()
+    
+    def __str__(self):
+        return self.name
+    
+    class Meta:
+        ordering = ['name']
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
     icon_class = models.CharField(max_length=50, help_text="CSS class for icon")
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -85,6 +222,18 @@ class Vehicle(models.Model):
         ('traveller', 'Traveller'),
     ]
     
+    # Unique orderings used for keyset pagination of vehicle listings
+    LISTING_ORDERINGS = {
+        'newest': ('-created_at', '-id'),
+        'price_asc': ('price_per_day', 'id'),
+        'price_desc': ('-price_per_day', '-id'),
+        'rating': ('-avg_rating', '-review_count', '-id'),
+    }
+    # Only valid on querysets from VehicleQuerySet.search()
+    SEARCH_ORDERING = ('search_rank', 'id')
+    # "N+ seats" buckets offered as facets
+    SEAT_FACETS = (2, 4, 5, 7)
+    
     name = models.CharField(max_length=200)
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     vehicle_type = models.CharField(max_length=20, choices=VEHICLE_TYPES)
@@ -103,55 +252,168 @@ class Vehicle(models.Model):
         validators=[validate_jpg_png_only],
         help_text="Upload JPG/JPEG or PNG image. Max size: 10MB, Max dimensions: 4000x4000px"
     )
+    image_sha256 = models.CharField(max_length=64, blank=True, editable=False)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_format = models.CharField(max_length=10, blank=True, editable=False)
+    image_bytes = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    has_image_derivatives = models.BooleanField(default=False, editable=False)
     description = models.TextField()
+    # Partner inventory identifier, the upsert key for import_fleet
+    fleet_code = models.CharField(max_length=64, unique=True, null=True, blank=True)
     features = models.TextField(help_text="Comma-separated features")
+    feature_tags = models.ManyToManyField(Feature, blank=True, related_name='vehicles', editable=False)
+    # Bit i is set when the vehicle has the Feature with bit=i
+    feature_mask = models.BigIntegerField(default=0, editable=False)
     is_available = models.BooleanField(default=True)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    avg_rating = models.FloatField(default=0, editable=False)
     mileage = models.CharField(max_length=50)
     color = models.CharField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = VehicleQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.brand} {self.model} - {self.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._synced_features = instance.__dict__.get('features')
+        # The image file name as stored, or None when the column was deferred
+        instance._stored_image = (instance.__dict__['image'] or '') if 'image' in instance.__dict__ else None
+        return instance
+    
     def get_features_list(self):
-        return [feature.strip() for feature in self.features.split(',') if feature.strip()]
+        # Templates call this several times per card; split once per value
+        cached = self.__dict__.get('_features_list')
+        if cached is None or cached[0] != self.features:
+            cached = self._features_list = (
+                self.features,
+                [feature.strip() for feature in self.features.split(',') if feature.strip()],
+            )
+        return cached[1]
+    
+    def sync_features(self):
+        """Mirror the features text into feature_tags and feature_mask"""
+        features = Feature.objects.resolve(self.features)
+        self.feature_tags.set(features)
+        self.feature_mask = mask_for_bits(feature.bit for feature in features)
+        Vehicle.objects.filter(pk=self.pk).update(feature_mask=self.feature_mask)
+        self._synced_features = self.features
     
     def get_price_per_24h(self):
         return self.price_per_day
     
+    @classmethod
+    def apply_review_delta(cls, vehicle_id, count_delta, sum_delta):
+        """Adjust the stored rating aggregates of a vehicle in a single UPDATE"""
+        new_count = models.F('review_count') + count_delta
+        new_sum = models.F('rating_sum') + sum_delta
+        cls.objects.filter(pk=vehicle_id).update(
+            review_count=new_count,
+            rating_sum=new_sum,
+            avg_rating=models.Case(
+                models.When(review_count=-count_delta, then=models.Value(0.0)),
+                default=Cast(new_sum, models.FloatField()) / new_count,
+            ),
+            updated_at=timezone.now(),
+        )
+    
     def clean(self):
         """Custom validation for the model"""
         super().clean()
         
-        if self.image:
-            # Additional validation when saving
-            try:
-                # Check if file exists and is accessible
-                if hasattr(self.image, 'file'):
-                    # Validate file size
-                    if self.image.size > 10 * 1024 * 1024:  # 10MB
-                        raise ValidationError('Image file size cannot exceed 10MB.')
-                    
-                    # Validate image format
-                    img = Image.open(self.image)
-                    if img.format not in ['JPEG', 'JPG', 'PNG']:
-                        raise ValidationError('Only JPG/JPEG or PNG images are allowed for vehicles.')
-                    
-                    # Validate dimensions
-                    if img.width > 4000 or img.height > 4000:
-                        raise ValidationError('Image dimensions cannot exceed 4000x4000 pixels.')
-                    
-                    # Reset file pointer
-                    self.image.seek(0)
-                    
-            except Exception as e:
-                raise ValidationError(f'Image validation failed: {str(e)}')
+        # Only a new upload needs checking; the validator memoizes its result,
+        # so this costs nothing after the field validator already ran
+        if self.image and not self.image._committed:
+            self.set_image_info(validate_jpg_png_only(self.image))
+        elif not self.image:
+            self.set_image_info(None)
+    
+    def set_image_info(self, info):
+        """Store the upload's metadata so nothing needs to reopen the file later"""
+        self.image_sha256 = info.sha256 if info else ''
+        self.image_format = info.format if info else ''
+        self.image_width = info.width if info else None
+        self.image_height = info.height if info else None
+        self.image_bytes = info.size if info else None
     
     def save(self, *args, **kwargs):
         """Override save method to ensure validation"""
         self.clean()
+        new_upload = bool(self.image) and not self.image._committed
+        if new_upload:
+            self.has_image_derivatives = False
         super().save(*args, **kwargs)
+        
+        if getattr(self, '_synced_features', None) != self.features:
+            self.sync_features()
+        
+        stored = getattr(self, '_stored_image', None)
+        if stored and stored != self.image.name:
+            # The image was replaced or cleared; its derivatives are orphans.
+            # Only once committed, as a rollback would still need them
+            storage = self.image.storage
+            transaction.on_commit(lambda: delete_derivatives(stored, storage), using=self._state.db)
+        self._stored_image = self.image.name or ''
+        
+        if new_upload:
+            try:
+                generate_derivatives(self.image.name, self.image.storage)
+            except (OSError, ValueError):
+                # Templates fall back to the original; build_image_derivatives can retry
+                logger.exception('Could not build derivatives for %s', self.image.name)
+            else:
+                # Cached cards are keyed by updated_at
+                self.updated_at = timezone.now()
+                Vehicle.objects.filter(pk=self.pk).update(has_image_derivatives=True, updated_at=self.updated_at)
+                self.has_image_derivatives = True
+    
+    def _image_srcset(self, ext):
+        # Derivatives are never upscaled: those wider than the original are
+        # the same pixels again, so only the first of them is offered, at
+        # its real width
+        storage = self.image.storage
+        candidates, widest = [], 0
+        for size, width in DERIVATIVE_WIDTHS.items():
+            width = min(width, self.image_width or width)
+            if width > widest:
+                candidates.append(f'{storage.url(derivative_name(self.image.name, size, ext))} {width}w')
+                widest = width
+        return ', '.join(candidates)
+    
+    @property
+    def image_webp_srcset(self):
+        return self._image_srcset('webp')
+    
+    @property
+    def image_jpeg_srcset(self):
+        return self._image_srcset('jpg')
+    
+    @property
+    def image_card_url(self):
+        """Card-sized JPEG when derivatives exist, otherwise the original"""
+        if self.has_image_derivatives:
+            return self.image.storage.url(derivative_name(self.image.name, 'card', 'jpg'))
+        return self.image.url
+    
+    class Meta:
+        # Listing pages only ever show available vehicles, so these are partial
+        # indexes over that subset. Each one ends in id so it matches a keyset
+        # ordering from LISTING_ORDERINGS exactly.
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='vehicle_available_idx', condition=models.Q(is_available=True)),
+            models.Index(fields=['vehicle_type', '-created_at', '-id'], name='vehicle_type_available_idx', condition=models.Q(is_available=True)),
+            models.Index(fields=['category', '-created_at', '-id'], name='vehicle_category_avail_idx', condition=models.Q(is_available=True)),
+            models.Index(fields=['price_per_day', 'id'], name='vehicle_price_idx', condition=models.Q(is_available=True)),
+            models.Index(fields=['-avg_rating', '-review_count', '-id'], name='vehicle_rating_idx', condition=models.Q(is_available=True)),
+            # MAX(updated_at) for API Last-Modified/ETag headers
+            models.Index(fields=['updated_at'], name='vehicle_updated_idx'),
+        ]
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -171,7 +433,8 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
-class Booking(models.Model):
+class BookingRecord(models.Model):
+    """Fields and display helpers shared by live and archived bookings"""
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('confirmed', 'Confirmed'),
@@ -180,6 +443,9 @@ class Booking(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
+    # Statuses that keep a vehicle reserved for the booked date range
+    BLOCKING_STATUSES = ['pending', 'confirmed', 'active']
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE)
     start_date = models.DateTimeField()
@@ -196,6 +462,8 @@ class Booking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    is_archived = False
+    
     def __str__(self):
         return f"Booking {self.id} - {self.user.username} - {self.vehicle.name}"
     
@@ -207,13 +475,58 @@ class Booking(models.Model):
         duration = self.end_date - self.start_date
         return duration.days
     
+    @property
+    def billing_period(self):
+        """Billed hours or days, rounded up the same way as the price"""
+        try:
+            return billable_units(self.start_date, self.end_date)
+        except ValueError:
+            return None
+    
+    class Meta:
+        abstract = True
+
+class Booking(BookingRecord):
+    objects = BookingQuerySet.as_manager()
+    
     def calculate_total_amount(self):
-        hours = self.get_duration_hours()
-        if hours <= 24:
-            return self.vehicle.price_per_hour * Decimal(str(round(hours, 2)))
-        else:
-            days = self.get_duration_days()
-            return self.vehicle.price_per_day * days
+        return quote(self.vehicle, self.start_date, self.end_date).total
+    
+    def has_conflict(self, using=None):
+        """Check whether another blocking booking overlaps this one"""
+        return (
+            Booking.objects.using(using).blocking()
+            .overlapping(self.start_date, self.end_date)
+            .filter(vehicle_id=self.vehicle_id)
+            .exclude(pk=self.pk)
+            .exists()
+        )
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['vehicle', 'start_date', 'end_date'], name='booking_vehicle_range_idx'),
+            models.Index(fields=['user', '-created_at'], name='booking_user_created_idx'),
+        ]
+
+class ArchivedBooking(BookingRecord):
+    """
+    A booking that ended long ago, moved out of Booking by "manage.py
+    archive_bookings" so the live table and its indexes stay small. Keeps the
+    original id and timestamps.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = BookingRecordQuerySet.as_manager()
+    
+    is_archived = True
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='archived_user_created_idx'),
+        ]
 
 class Review(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -227,3 +540,6 @@ class Review(models.Model):
     
     class Meta:
         unique_together = ('user', 'vehicle')
+        indexes = [
+            models.Index(fields=['vehicle', '-created_at'], name='review_vehicle_created_idx'),
+        ]
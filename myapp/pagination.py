@@ -0,0 +1,171 @@
+import base64
+import binascii
+import datetime
+import json
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class CursorPage:
+    """One page of a keyset-paginated queryset"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over a unique ordering such as ('-created_at', '-id').
+
+    Instead of OFFSET, each page seeks past the last row of the previous one,
+    so any page costs the same as the first one as long as an index matches
+    the ordering.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.fields = [
+            (name.lstrip('-'), name.startswith('-'), self._resolve_field(queryset, name.lstrip('-')))
+            for name in self.ordering
+        ]
+
+    @staticmethod
+    def _resolve_field(queryset, name):
+        """Model field, or the output field of an annotation such as search_rank"""
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        return queryset.model._meta.get_field(name)
+
+    @staticmethod
+    def _key_value(obj, name, field):
+        # values() rows are dicts; to_python() reads these strings back
+        if isinstance(obj, dict):
+            value = obj[name]
+            if isinstance(value, (datetime.date, datetime.time)):
+                return value.isoformat()
+            return str(value) if isinstance(value, Decimal) else value
+        if getattr(field, 'model', None) is None:
+            return getattr(obj, name)
+        return field.value_to_string(obj)
+
+    def encode_cursor(self, obj):
+        values = [self._key_value(obj, name, field) for name, _, field in self.fields]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return the typed key values of a cursor, or None when it is malformed"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                return None
+            return [field.to_python(value) for (_, _, field), value in zip(self.fields, values)]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            return None
+
+    def _seek(self, values, backwards):
+        """
+        Rows strictly after (or before) the key, nested so the leading column
+        is a plain range condition the index can seek on:
+
+            a <= x AND (a < x OR (a = x AND (b < y OR (b = y AND ...))))
+        """
+        def lookup(descending):
+            return 'gt' if descending == backwards else 'lt'
+
+        (last_name, last_desc, _), last_value = self.fields[-1], values[-1]
+        condition = Q(**{f'{last_name}__{lookup(last_desc)}': last_value})
+        for (name, descending, _), value in reversed(list(zip(self.fields[:-1], values[:-1]))):
+            condition = Q(**{f'{name}__{lookup(descending)}': value}) | (Q(**{name: value}) & condition)
+
+        first_name, first_desc, _ = self.fields[0]
+        bound = Q(**{f'{first_name}__{lookup(first_desc)}e': values[0]})  # lte / gte
+        return bound & condition
+
+    def _page_queryset(self, after, before):
+        """(queryset for the page plus one look-ahead row, decoded position, backwards)"""
+        queryset = self.queryset
+        ordering = self.ordering
+        position = None
+        backwards = False
+
+        if after:
+            position = self.decode_cursor(after)
+        elif before:
+            position = self.decode_cursor(before)
+            backwards = position is not None
+
+        if backwards:
+            ordering = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, backwards))
+
+        # Fetch one extra row to learn whether there is another page
+        return queryset.order_by(*ordering)[:self.per_page + 1], position, backwards
+
+    def _build_page(self, rows, position, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows)
+
+        if backwards:
+            next_cursor = self.encode_cursor(rows[-1])
+            previous_cursor = self.encode_cursor(rows[0]) if has_more else None
+        else:
+            next_cursor = self.encode_cursor(rows[-1]) if has_more else None
+            previous_cursor = self.encode_cursor(rows[0]) if position is not None else None
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+    def get_page(self, after=None, before=None):
+        queryset, position, backwards = self._page_queryset(after, before)
+        return self._build_page(list(queryset), position, backwards)
+
+    async def aget_page(self, after=None, before=None):
+        queryset, position, backwards = self._page_queryset(after, before)
+        return self._build_page([row async for row in queryset], position, backwards)
+
+
+def capped_count(queryset, limit):
+    """
+    Count at most ``limit`` + 1 rows. Returns (count, is_lower_bound) so large
+    result sets are reported as "limit+" without a full COUNT(*).
+    """
+    count = queryset.order_by()[:limit + 1].count()
+    if count > limit:
+        return limit, True
+    return count, False
+
+
+async def acapped_count(queryset, limit):
+    count = await queryset.order_by()[:limit + 1].acount()
+    if count > limit:
+        return limit, True
+    return count, False
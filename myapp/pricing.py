@@ -0,0 +1,53 @@
+"""
+Rental pricing: the one place the rounding rules live.
+
+Rentals of up to 24 hours are charged per started hour, longer ones per
+started day. A date range is converted to billable units once, then every
+vehicle's quote is just its rate times that count, so a whole page of
+vehicles is priced in one pass.
+"""
+import math
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+HOURLY_LIMIT_HOURS = 24
+CENTS = Decimal('0.01')
+
+Quote = namedtuple('Quote', 'vehicle_id unit units rate total')
+
+
+class BillingPeriod(namedtuple('BillingPeriod', 'unit count')):
+    def __str__(self):
+        return f'{self.count} {self.unit}{"" if self.count == 1 else "s"}'
+
+
+def billable_units(start, end):
+    """BillingPeriod('hour' | 'day', count) for a range; partial hours and days round up"""
+    if end <= start:
+        raise ValueError('End must be after start')
+    hours = (end - start).total_seconds() / 3600
+    if hours <= HOURLY_LIMIT_HOURS:
+        return BillingPeriod('hour', math.ceil(hours))
+    return BillingPeriod('day', math.ceil(hours / 24))
+
+
+def quote_many(vehicles, start, end):
+    """
+    {vehicle id: Quote} for Vehicle instances or (id, price_per_hour,
+    price_per_day) rows, all for the same date range.
+    """
+    unit, units = billable_units(start, end)
+    quotes = {}
+    for vehicle in vehicles:
+        if isinstance(vehicle, tuple):
+            vehicle_id, price_per_hour, price_per_day = vehicle
+        else:
+            vehicle_id, price_per_hour, price_per_day = vehicle.pk, vehicle.price_per_hour, vehicle.price_per_day
+        rate = price_per_hour if unit == 'hour' else price_per_day
+        total = (rate * units).quantize(CENTS, rounding=ROUND_HALF_UP)
+        quotes[vehicle_id] = Quote(vehicle_id, unit, units, rate, total)
+    return quotes
+
+
+def quote(vehicle, start, end):
+    return quote_many([vehicle], start, end)[vehicle.pk]
@@ -0,0 +1,108 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary ("default"). GET and HEAD requests for the
+read-only views below read from a random replica in
+settings.DATABASE_REPLICAS, unless the client wrote something recently:
+any write marks the response with a short-lived cookie, and while it's
+present every read goes to the primary too, so a user sees their own new
+booking straight away despite replication lag.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+READ_ONLY_VIEWS = {'home', 'vehicle_list', 'vehicle_detail', 'category_vehicles'}
+PIN_COOKIE = 'db_primary'
+# A lagging replica must never make a fresh login look logged out
+PRIMARY_ONLY_APPS = {'auth', 'sessions'}
+
+
+class RoutingState:
+    def __init__(self):
+        self.read_db = None
+        self.wrote = False
+
+
+# Per request (and per task under ASGI); outside requests nothing is routed
+# to replicas
+_state = ContextVar('db_routing_state', default=None)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.wrote:
+            return None  # Django then uses the instance's database or the primary
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return state.read_db
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """Pick the read database for each request and pin writers to the primary"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin_writer(response, state)
+
+    async def __acall__(self, request):
+        # The ORM's worker thread runs in a copy of this context, so the
+        # router sees (and updates) the same state
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.pin_writer(response, state)
+
+    def pin_writer(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and request.method in ('GET', 'HEAD')
+            and request.resolver_match.url_name in READ_ONLY_VIEWS
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            _state.get().read_db = random.choice(replicas)
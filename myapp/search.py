@@ -0,0 +1,93 @@
+"""
+Full-text vehicle search backed by an SQLite FTS5 external-content table.
+
+The index lives in ``myapp_vehicle_fts`` and is kept in sync with
+``myapp_vehicle`` by triggers. Other database backends fall back to a
+case-insensitive LIKE search over the same columns.
+"""
+import re
+
+FTS_TABLE = 'myapp_vehicle_fts'
+FTS_COLUMNS = ('name', 'brand', 'model', 'description', 'features')
+# bm25() column weights, in FTS_COLUMNS order
+FTS_RANK = 'bm25(10.0, 5.0, 5.0, 1.0, 2.0)'
+
+_columns = ', '.join(FTS_COLUMNS)
+_new = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+_old = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+
+TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON myapp_vehicle BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new});
+        END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON myapp_vehicle BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+        END
+    """,
+    # Only text changes touch the index, not availability or rating updates
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON myapp_vehicle BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new});
+        END
+    """,
+}
+
+
+def install_fts(connection, repair_only=False):
+    """
+    Create the FTS table and triggers where missing, then rebuild the index.
+    With ``repair_only`` nothing happens unless the FTS table already exists.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s OR name IN (%s, %s, %s)",
+            [FTS_TABLE, *TRIGGERS],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing >= {FTS_TABLE, *TRIGGERS}:
+            return False
+        if repair_only and FTS_TABLE not in existing:
+            return False
+
+        if FTS_TABLE not in existing:
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+                    {_columns},
+                    content='myapp_vehicle', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES('rank', '{FTS_RANK}')")
+        for name, sql in TRIGGERS.items():
+            if name not in existing:
+                cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+    return True
+
+
+def uninstall_fts(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def search_terms(text):
+    """Split user input into plain word tokens"""
+    return re.findall(r'\w+', text or '')
+
+
+def fts_match_query(text):
+    """
+    Turn free text into a safe FTS5 query: every word must match, as a
+    prefix, in any column. Returns '' when there is nothing to search for.
+    """
+    return ' '.join(f'"{term}"*' for term in search_terms(text))
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .caching import bump_catalog_version, invalidate_booking_stats, invalidate_home_context
+from .models import Vehicle, Category, Booking, Review, Feature
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, raw=False, **kwargs):
+    """Keep the stored rating so post_save can apply only the difference"""
+    instance._previous_rating = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_rating = (
+        Review.objects.filter(pk=instance.pk).values_list('vehicle_id', 'rating').first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None:
+        Vehicle.apply_review_delta(instance.vehicle_id, 1, instance.rating)
+        return
+
+    old_vehicle_id, old_rating = previous
+    if old_vehicle_id == instance.vehicle_id:
+        if old_rating != instance.rating:
+            Vehicle.apply_review_delta(instance.vehicle_id, 0, instance.rating - old_rating)
+    else:
+        Vehicle.apply_review_delta(old_vehicle_id, -1, -old_rating)
+        Vehicle.apply_review_delta(instance.vehicle_id, 1, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    Vehicle.apply_review_delta(instance.vehicle_id, -1, -instance.rating)
+
+
+@receiver(post_save, sender=Vehicle)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def clear_home_cache(sender, **kwargs):
+    invalidate_home_context()
+    bump_catalog_version()
+    # Drop anything a concurrent request cached before this transaction committed
+    transaction.on_commit(invalidate_home_context)
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def clear_booking_stats(sender, instance, **kwargs):
+    invalidate_booking_stats(instance.user_id)
+    transaction.on_commit(lambda: invalidate_booking_stats(instance.user_id))
+
+
+@receiver(post_delete, sender=Feature)
+def release_feature_bit(sender, instance, **kwargs):
+    """Clear the bit from every mask so a new feature can reuse it safely"""
+    if instance.bit is None:
+        return
+    bit = 1 << instance.bit
+    Vehicle.objects.alias(has_bit=F('feature_mask').bitand(bit)).filter(has_bit=bit).update(
+        feature_mask=F('feature_mask').bitand(~bit), updated_at=timezone.now(),
+    )
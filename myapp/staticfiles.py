@@ -0,0 +1,139 @@
+"""
+Fingerprinted, precompressed static files served with far-future caching.
+
+collectstatic with CompressedManifestStaticFilesStorage copies every file
+under a name carrying a hash of its content (css/style.css becomes
+css/style.1a2b3c4d5e6f.css) and rewrites url() references in CSS to match,
+so {% static %} links change whenever the file does. Text files also get
+a .gz copy, and a .br copy when the optional brotli package is installed,
+so nothing is compressed per request.
+
+StaticFilesMiddleware serves STATIC_ROOT from the app server. A hashed
+name never changes content, so browsers may keep it for a year without
+revalidating; other names must be revalidated against Last-Modified.
+"""
+import gzip
+import mimetypes
+import os
+import re
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.map', '.txt', '.xml', '.html'}
+# Smaller files barely shrink, and the headers cost more than the saving
+MIN_COMPRESS_SIZE = 200
+# Preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+
+
+def compress(data):
+    """Map encoding to compressed bytes, for the encodings that make data smaller"""
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes .gz/.br copies of text files"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Both the original and the hashed copy, as unhashed names still
+        # get served to anything that doesn't use {% static %}
+        for name in {*paths, *self.hashed_files.values()}:
+            self.write_compressed(name)
+
+    def write_compressed(self, name):
+        if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS or not self.exists(name):
+            return
+        with self.open(name) as fh:
+            data = fh.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for encoding, body in compress(data).items():
+            with open(self.path(name) + dict(ENCODINGS)[encoding], 'wb') as fh:
+                fh.write(body)
+
+
+def accepted_encodings(header):
+    """Content codings listed in an Accept-Encoding header, minus those with q=0"""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        if coding.strip() and not re.fullmatch(r'\s*q\s*=\s*0(\.0*)?\s*', params):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """Serve collected static files before the rest of the stack runs"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        self.root = settings.STATIC_ROOT
+        # Names written by collectstatic with their hash, read once per process
+        manifest = getattr(staticfiles_storage, 'load_manifest', None)
+        self.immutable = set(manifest()[0].values()) if manifest else set()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.serve(request) or await self.get_response(request)
+
+    def serve(self, request):
+        if not (self.root and request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix)):
+            return None
+        name = request.path[len(self.prefix):]
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        stat = os.stat(path)
+        immutable = name in self.immutable
+        if not immutable and not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+            return HttpResponseNotModified()
+
+        content_type, _ = mimetypes.guess_type(path)
+        variants = [(encoding, path + suffix) for encoding, suffix in ENCODINGS if os.path.isfile(path + suffix)]
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        encoding, served = next(((e, p) for e, p in variants if e in accepted), (None, path))
+
+        response = FileResponse(open(served, 'rb'), content_type=content_type or 'application/octet-stream')
+        del response['Content-Disposition']
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if variants:
+            response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        return response
@@ -1,9 +1,11 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.home, name='home'),
     path('vehicles/', views.vehicle_list, name='vehicle_list'),
+    path('vehicles/facets/', views.vehicle_facets, name='vehicle_facets'),
+    path('vehicles/quotes/', views.vehicle_quotes, name='vehicle_quotes'),
     path('vehicle/<int:vehicle_id>/', views.vehicle_detail, name='vehicle_detail'),
     path('category/<int:category_id>/', views.category_vehicles, name='category_vehicles'),
     path('register/', views.register, name='register'),
@@ -17,4 +19,9 @@ urlpatterns = [
     path('add-review/<int:vehicle_id>/', views.add_review, name='add_review'),
     path('about/', views.about, name='about'),
     path('contact/', views.contact, name='contact'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('api/v1/vehicles/', api.vehicle_list, name='api_vehicle_list'),
+    path('api/v1/vehicles/<int:vehicle_id>/', api.vehicle_detail, name='api_vehicle_detail'),
+    path('api/v1/vehicles/<int:vehicle_id>/reviews/', api.vehicle_reviews, name='api_vehicle_reviews'),
+    path('api/v1/categories/', api.category_list, name='api_category_list'),
 ]
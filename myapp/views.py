@@ -2,108 +2,209 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Avg
+from django.db import transaction
+from django.db.models import Q
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 from .models import Vehicle, Category, Booking, Review, UserProfile
-from .forms import UserRegistrationForm, UserProfileForm, BookingForm, ReviewForm, VehicleSearchForm
+from .archive import BookingHistory
+from .bookings import BookingConflict, reserve
+from .caching import get_home_context, get_booking_stats, get_vehicle_facets
+from .forms import UserRegistrationForm, UserProfileForm, BookingForm, ReviewForm, VehicleSearchForm, QuoteForm
+from .metrics import render_metrics
+from .pagination import CursorPaginator, capped_count
+from .pricing import billable_units, quote_many
+from .search import search_terms
 from datetime import datetime, timedelta
 
+# Listing totals above this are shown as "N+" instead of running a full COUNT
+LISTING_COUNT_LIMIT = 1000
+
+# Facet name (also its query parameter) -> heading, in display order
+FACET_GROUPS = (
+    ('vehicle_type', 'Type'),
+    ('category', 'Category'),
+    ('brand', 'Brand'),
+    ('fuel_type', 'Fuel'),
+    ('transmission', 'Transmission'),
+    ('seats', 'Seats'),
+)
+FACET_LIMIT = 6
+
+def facet_groups(request, facets):
+    """Top facet values per group, each with a link that applies it as a filter"""
+    groups = []
+    for name, title in FACET_GROUPS:
+        entries = []
+        for facet in facets[name][:FACET_LIMIT]:
+            params = request.GET.copy()
+            params.pop('after', None)
+            params.pop('before', None)
+            params[name] = facet['value']
+            entries.append({**facet, 'url': f'?{params.urlencode()}'})
+        if entries:
+            groups.append((name, title, entries))
+    return groups
+
+def cursor_page_urls(request, page_obj):
+    """Previous/next links for a cursor page, keeping the current filters"""
+    urls = {'previous_page_url': None, 'next_page_url': None}
+    for key, cursor, direction in (
+        ('previous_page_url', page_obj.previous_cursor, 'before'),
+        ('next_page_url', page_obj.next_cursor, 'after'),
+    ):
+        if cursor:
+            params = request.GET.copy()
+            params.pop('after', None)
+            params.pop('before', None)
+            params[direction] = cursor
+            urls[key] = f'?{params.urlencode()}'
+    return urls
+
 def home(request):
     """Home page with featured vehicles and categories"""
-    featured_vehicles = Vehicle.objects.filter(is_available=True).order_by('-created_at')[:6]
-    categories = Category.objects.all()
-    
-    # Get vehicle counts by type
-    bike_count = Vehicle.objects.filter(vehicle_type='bike', is_available=True).count()
-    car_count = Vehicle.objects.filter(vehicle_type='car', is_available=True).count()
-    traveller_count = Vehicle.objects.filter(vehicle_type='traveller', is_available=True).count()
-    
-    context = {
-        'featured_vehicles': featured_vehicles,
-        'categories': categories,
-        'bike_count': bike_count,
-        'car_count': car_count,
-        'traveller_count': traveller_count,
-    }
-    return render(request, 'myapp/home.html', context)
+    return render(request, 'myapp/home.html', get_home_context())
 
-def vehicle_list(request):
-    """Display all available vehicles with search and filtering"""
-    vehicles = Vehicle.objects.filter(is_available=True).order_by('-created_at')
-    search_form = VehicleSearchForm(request.GET)
+def filter_vehicles(search_form):
+    """Available vehicles narrowed by a bound VehicleSearchForm; returns (vehicles, ordering)"""
+    vehicles = Vehicle.objects.filter(is_available=True)
+    ordering = Vehicle.LISTING_ORDERINGS['newest']
     
     if search_form.is_valid():
+        q = search_form.cleaned_data.get('q')
         vehicle_type = search_form.cleaned_data.get('vehicle_type')
         brand = search_form.cleaned_data.get('brand')
+        category = search_form.cleaned_data.get('category')
+        fuel_type = search_form.cleaned_data.get('fuel_type')
+        transmission = search_form.cleaned_data.get('transmission')
         min_price = search_form.cleaned_data.get('min_price')
         max_price = search_form.cleaned_data.get('max_price')
         seats = search_form.cleaned_data.get('seats')
+        features = search_form.cleaned_data.get('features')
+        start = search_form.cleaned_data.get('start')
+        end = search_form.cleaned_data.get('end')
         
         if vehicle_type:
             vehicles = vehicles.filter(vehicle_type=vehicle_type)
         if brand:
             vehicles = vehicles.filter(brand__icontains=brand)
+        if category:
+            vehicles = vehicles.filter(category=category)
+        if fuel_type:
+            vehicles = vehicles.filter(fuel_type=fuel_type)
+        if transmission:
+            vehicles = vehicles.filter(transmission=transmission)
         if min_price:
             vehicles = vehicles.filter(price_per_day__gte=min_price)
         if max_price:
             vehicles = vehicles.filter(price_per_day__lte=max_price)
         if seats:
             vehicles = vehicles.filter(seats__gte=seats)
+        if features:
+            vehicles = vehicles.with_features(features)
+        if start and end:
+            vehicles = vehicles.available_between(start, end)
+        
+        sort = search_form.cleaned_data.get('sort')
+        if q and search_terms(q):
+            vehicles = vehicles.search(q)
+            # Best match is the default ordering when searching
+            if not sort:
+                ordering = Vehicle.SEARCH_ORDERING
+        if sort:
+            ordering = Vehicle.LISTING_ORDERINGS[sort]
     
-    # Enhanced pagination with better error handling
-    paginator = Paginator(vehicles, 12)
-    page_number = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.get_page(page_number)
-    except PageNotAnInteger:
-        page_obj = paginator.get_page(1)
-    except EmptyPage:
-        page_obj = paginator.get_page(paginator.num_pages)
-    
-    # Get page range for better pagination display
-    page_range = paginator.get_elided_page_range(
-        page_obj.number, 
-        on_each_side=2, 
-        on_ends=1
-    )
+    return vehicles, ordering
+
+def vehicle_list_context(request, search_form, page_obj, total, facets):
+    """Template context for a fetched vehicle list page (shared with the async view)"""
+    total_vehicles, total_is_estimate = total
+    # With dates in the search, show each card's total for that range
+    if search_form.is_valid() and search_form.cleaned_data.get('start'):
+        quotes = quote_many(page_obj, search_form.cleaned_data['start'], search_form.cleaned_data['end'])
+        for vehicle in page_obj:
+            vehicle.quote = quotes[vehicle.pk]
     
-    context = {
+    return {
         'page_obj': page_obj,
-        'page_range': page_range,
         'search_form': search_form,
-        'total_vehicles': vehicles.count(),
-        'total_pages': paginator.num_pages,
-        'current_page': page_obj.number,
+        'total_vehicles': total_vehicles,
+        'total_is_estimate': total_is_estimate,
+        'facet_groups': facet_groups(request, facets),
+        **cursor_page_urls(request, page_obj),
     }
+
+def vehicle_list(request):
+    """Display all available vehicles with search and filtering"""
+    search_form = VehicleSearchForm(request.GET)
+    vehicles, ordering = filter_vehicles(search_form)
+    
+    # Keyset pagination: deep pages cost the same as the first one
+    paginator = CursorPaginator(vehicles, 12, ordering)
+    page_obj = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
+    context = vehicle_list_context(
+        request, search_form, page_obj,
+        capped_count(vehicles, LISTING_COUNT_LIMIT),
+        get_vehicle_facets(vehicles, search_form.filter_signature()),
+    )
     return render(request, 'myapp/vehicle_list.html', context)
 
+def vehicle_facets(request):
+    """Facet counts for the vehicle list filters as JSON"""
+    search_form = VehicleSearchForm(request.GET)
+    vehicles, _ = filter_vehicles(search_form)
+    facets = get_vehicle_facets(vehicles, search_form.filter_signature())
+    return JsonResponse({
+        'total': sum(facet['count'] for facet in facets['vehicle_type']),
+        'facets': facets,
+        'errors': search_form.errors.get_json_data(),
+    })
+
+def vehicle_quotes(request):
+    """Price of each requested vehicle for one date range, as JSON"""
+    form = QuoteForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+    
+    start, end = form.cleaned_data['start'], form.cleaned_data['end']
+    rows = Vehicle.objects.filter(pk__in=form.cleaned_data['ids']).values_list('pk', 'price_per_hour', 'price_per_day')
+    period = billable_units(start, end)
+    return JsonResponse({
+        'unit': period.unit,
+        'units': period.count,
+        'period': str(period),
+        'quotes': {
+            str(vehicle_id): {'rate': str(q.rate), 'total': str(q.total)}
+            for vehicle_id, q in quote_many(rows, start, end).items()
+        },
+    })
+
+def similar_vehicles_for(vehicle):
+    return Vehicle.objects.filter(
+        vehicle_type=vehicle.vehicle_type,
+        is_available=True
+    ).exclude(id=vehicle.id)[:4]
+
 def vehicle_detail(request, vehicle_id):
     """Display detailed information about a specific vehicle"""
     vehicle = get_object_or_404(Vehicle, id=vehicle_id)
-    reviews = Review.objects.filter(vehicle=vehicle).order_by('-created_at')
-    avg_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
+    reviews = Review.objects.filter(vehicle=vehicle).select_related('user').order_by('-created_at')
     
     # Check if user has already reviewed this vehicle
     user_review = None
     if request.user.is_authenticated:
         user_review = Review.objects.filter(user=request.user, vehicle=vehicle).first()
     
-    # Get similar vehicles
-    similar_vehicles = Vehicle.objects.filter(
-        vehicle_type=vehicle.vehicle_type,
-        is_available=True
-    ).exclude(id=vehicle.id)[:4]
-    
     context = {
         'vehicle': vehicle,
         'reviews': reviews,
-        'avg_rating': round(avg_rating, 1),
+        'avg_rating': round(vehicle.avg_rating, 1),
         'user_review': user_review,
-        'similar_vehicles': similar_vehicles,
+        'similar_vehicles': similar_vehicles_for(vehicle),
     }
     return render(request, 'myapp/vehicle_detail.html', context)
 
@@ -173,13 +274,15 @@ def profile(request):
     else:
         form = UserProfileForm(instance=profile)
     
-    # Get user's bookings
-    bookings = Booking.objects.filter(user=request.user).order_by('-created_at')
+    # Get user's most recent bookings
+    booking_stats = get_booking_stats(request.user.id)
+    bookings = BookingHistory(request.user.id, booking_stats)[:5]
     
     context = {
         'profile': profile,
         'form': form,
         'bookings': bookings,
+        'booking_stats': booking_stats,
     }
     return render(request, 'myapp/profile.html', context)
 
@@ -199,11 +302,13 @@ def book_vehicle(request, vehicle_id):
                 booking = form.save(commit=False)
                 booking.user = request.user
                 booking.vehicle = vehicle
-                booking.total_amount = booking.calculate_total_amount()
-                booking.save()
+                # Conflict check and insert happen under a per-vehicle lock
+                reserve(booking)
                 
                 messages.success(request, 'Vehicle booked successfully!')
                 return redirect('booking_confirmation', booking_id=booking.id)
+            except BookingConflict as e:
+                messages.error(request, str(e))
             except Exception as e:
                 messages.error(request, f'Error creating booking: {str(e)}')
         else:
@@ -229,10 +334,11 @@ def booking_confirmation(request, booking_id):
 @login_required
 def my_bookings(request):
     """Display user's bookings with pagination"""
-    all_bookings = Booking.objects.filter(user=request.user).order_by('-created_at')
+    booking_stats = get_booking_stats(request.user.id)
     
-    # Pagination for bookings
-    paginator = Paginator(all_bookings, 10)
+    # Pagination for bookings. The statistics already hold the total, so
+    # there's no COUNT, and the archive is only read past the live bookings
+    paginator = Paginator(BookingHistory(request.user.id, booking_stats), 10)
     page_number = request.GET.get('page')
     
     try:
@@ -249,18 +355,10 @@ def my_bookings(request):
         on_ends=1
     )
     
-    # Filter bookings for statistics
-    active_bookings = all_bookings.filter(status__in=['pending', 'confirmed', 'active'])
-    pending_bookings = all_bookings.filter(status='pending')
-    completed_bookings = all_bookings.filter(status='completed')
-    
     context = {
         'page_obj': page_obj,
         'page_range': page_range,
-        'all_bookings': all_bookings,  # For statistics
-        'active_bookings': active_bookings,
-        'pending_bookings': pending_bookings,
-        'completed_bookings': completed_bookings,
+        'booking_stats': booking_stats,
         'total_pages': paginator.num_pages,
         'current_page': page_obj.number,
     }
@@ -291,7 +389,9 @@ def add_review(request, vehicle_id):
         review = form.save(commit=False)
         review.user = request.user
         review.vehicle = vehicle
-        review.save()
+        # Keep the review and the vehicle's rating aggregates in one transaction
+        with transaction.atomic():
+            review.save()
         messages.success(request, 'Review added successfully!')
     else:
         messages.error(request, 'Error adding review.')
@@ -306,37 +406,31 @@ def contact(request):
     """Contact page"""
     return render(request, 'myapp/contact.html')
 
+def metrics(request):
+    """Request metrics for Prometheus to scrape"""
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not constant_time_compare(request.headers.get('Authorization', ''), expected):
+            return HttpResponse(status=403)
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 def category_vehicles(request, category_id):
     """Display vehicles by category with pagination"""
     category = get_object_or_404(Category, id=category_id)
-    vehicles = Vehicle.objects.filter(category=category, is_available=True).order_by('-created_at')
+    vehicles = Vehicle.objects.filter(category=category, is_available=True)
     all_categories = Category.objects.all()
     
-    # Pagination for category vehicles
-    paginator = Paginator(vehicles, 9)
-    page_number = request.GET.get('page')
-    
-    try:
-        page_obj = paginator.get_page(page_number)
-    except PageNotAnInteger:
-        page_obj = paginator.get_page(1)
-    except EmptyPage:
-        page_obj = paginator.get_page(paginator.num_pages)
-    
-    # Get page range for better pagination display
-    page_range = paginator.get_elided_page_range(
-        page_obj.number, 
-        on_each_side=2, 
-        on_ends=1
-    )
+    paginator = CursorPaginator(vehicles, 9, Vehicle.LISTING_ORDERINGS['newest'])
+    page_obj = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
+    total_vehicles, total_is_estimate = capped_count(vehicles, LISTING_COUNT_LIMIT)
     
     context = {
         'category': category,
         'page_obj': page_obj,
-        'page_range': page_range,
         'vehicles': page_obj,  # Use paginated vehicles
         'all_categories': all_categories,
-        'total_pages': paginator.num_pages,
-        'current_page': page_obj.number,
+        'total_vehicles': total_vehicles,
+        'total_is_estimate': total_is_estimate,
+        **cursor_page_urls(request, page_obj),
     }
     return render(request, 'myapp/category_vehicles.html', context)
@@ -260,30 +260,12 @@ function showNotification(message, type = 'info') {
     }, 5000);
 }
 
-// Price calculator for booking
+// Price quote for booking, from the server so the rounding matches what is charged
 function calculatePrice(vehicleId, startDate, endDate) {
-    const start = new Date(startDate);
-    const end = new Date(endDate);
-    const hours = (end - start) / (1000 * 60 * 60);
-    
-    // Get vehicle prices from data attributes or make AJAX call
-    const vehicleCard = document.querySelector(`[data-vehicle-id="${vehicleId}"]`);
-    if (vehicleCard) {
-        const pricePerHour = parseFloat(vehicleCard.dataset.pricePerHour);
-        const pricePerDay = parseFloat(vehicleCard.dataset.pricePerDay);
-        
-        let totalPrice;
-        if (hours <= 24) {
-            totalPrice = pricePerHour * hours;
-        } else {
-            const days = Math.ceil(hours / 24);
-            totalPrice = pricePerDay * days;
-        }
-        
-        return totalPrice.toFixed(2);
-    }
-    
-    return 0;
+    const params = new URLSearchParams({start: startDate, end: endDate, ids: vehicleId});
+    return fetch(`/vehicles/quotes/?${params.toString()}`)
+        .then(response => response.ok ? response.json() : null)
+        .then(data => (data && data.quotes[vehicleId]) ? data.quotes[vehicleId].total : 0);
 }
 
 // Image lazy loading
@@ -0,0 +1,57 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('.needs-validation');
+    const startDateInput = form.elements.start_date;
+    const endDateInput = form.elements.end_date;
+    const vehicleId = form.dataset.vehicleId;
+    const durationDisplay = document.getElementById('duration-display');
+    const priceDisplay = document.getElementById('price-display');
+    
+    // The server owns the rounding rules; this only displays its quote
+    function calculateDurationAndPrice() {
+        const startDate = new Date(startDateInput.value);
+        const endDate = new Date(endDateInput.value);
+        
+        if (startDateInput.value && endDateInput.value && startDate < endDate) {
+            const params = new URLSearchParams({
+                start: startDateInput.value,
+                end: endDateInput.value,
+                ids: vehicleId
+            });
+            fetch(form.dataset.quotesUrl + '?' + params.toString())
+                .then(response => response.ok ? response.json() : null)
+                .then(data => {
+                    if (!data) return;
+                    durationDisplay.textContent = data.period;
+                    priceDisplay.textContent = `₹${data.quotes[vehicleId].total}`;
+                });
+        } else {
+            durationDisplay.textContent = 'Select dates to see duration';
+            priceDisplay.textContent = '₹0';
+        }
+    }
+    
+    // Add event listeners
+    startDateInput.addEventListener('change', calculateDurationAndPrice);
+    endDateInput.addEventListener('change', calculateDurationAndPrice);
+    
+    // Set minimum date to today
+    const today = new Date().toISOString().slice(0, 16);
+    startDateInput.min = today;
+    
+    // Update end date min when start date changes
+    startDateInput.addEventListener('change', function() {
+        endDateInput.min = this.value;
+        if (endDateInput.value && endDateInput.value <= this.value) {
+            endDateInput.value = '';
+        }
+    });
+    
+    // Form validation
+    form.addEventListener('submit', function(event) {
+        if (!form.checkValidity()) {
+            event.preventDefault();
+            event.stopPropagation();
+        }
+        form.classList.add('was-validated');
+    });
+});
@@ -0,0 +1,9 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Add success animation delay
+    setTimeout(function() {
+        document.querySelector('.success-icon').style.animation = 'bounceIn 1s ease-out';
+    }, 500);
+    
+    // Auto-scroll to top
+    window.scrollTo(0, 0);
+});
@@ -0,0 +1,66 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const sortSelect = document.getElementById('sortSelect');
+    const filterSelect = document.getElementById('filterSelect');
+    const vehiclesContainer = document.getElementById('vehiclesContainer');
+    const vehicleItems = document.querySelectorAll('.vehicle-item');
+    
+    function sortAndFilterVehicles() {
+        const sortValue = sortSelect.value;
+        const filterValue = filterSelect.value;
+        
+        // Filter vehicles
+        vehicleItems.forEach(item => {
+            const vehicleType = item.dataset.type;
+            let showItem = true;
+            
+            if (filterValue && vehicleType !== filterValue) {
+                showItem = false;
+            }
+            
+            item.style.display = showItem ? 'block' : 'none';
+        });
+        
+        // Sort vehicles
+        const visibleItems = Array.from(vehicleItems).filter(item => 
+            item.style.display !== 'none'
+        );
+        
+        if (sortValue) {
+            visibleItems.sort((a, b) => {
+                switch(sortValue) {
+                    case 'price_low':
+                        return parseFloat(a.dataset.price) - parseFloat(b.dataset.price);
+                    case 'price_high':
+                        return parseFloat(b.dataset.price) - parseFloat(a.dataset.price);
+                    case 'name':
+                        return a.dataset.name.localeCompare(b.dataset.name);
+                    case 'year':
+                        return parseInt(b.dataset.year) - parseInt(a.dataset.year);
+                    default:
+                        return 0;
+                }
+            });
+            
+            // Reorder in DOM
+            visibleItems.forEach(item => {
+                vehiclesContainer.appendChild(item);
+            });
+        }
+    }
+    
+    // Add event listeners
+    sortSelect.addEventListener('change', sortAndFilterVehicles);
+    filterSelect.addEventListener('change', sortAndFilterVehicles);
+    
+    // Add hover effects
+    const vehicleCards = document.querySelectorAll('.vehicle-card');
+    vehicleCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px)';
+        });
+        
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
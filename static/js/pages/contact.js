@@ -0,0 +1,93 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Contact form handling
+    const contactForm = document.querySelector('.contact-form');
+    
+    contactForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        
+        // Get form data
+        const formData = new FormData(this);
+        const firstName = document.getElementById('firstName').value;
+        const lastName = document.getElementById('lastName').value;
+        const email = document.getElementById('email').value;
+        const phone = document.getElementById('phone').value;
+        const subject = document.getElementById('subject').value;
+        const message = document.getElementById('message').value;
+        
+        // Hide any existing alerts
+        hideAlerts();
+        
+        // Basic validation
+        if (!firstName || !lastName || !email || !phone || !subject || !message) {
+            showError('Please fill in all required fields.');
+            return;
+        }
+        
+        // Email validation
+        const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+        if (!emailRegex.test(email)) {
+            showError('Please enter a valid email address.');
+            return;
+        }
+        
+        // Phone validation
+        const phoneRegex = /^[\+]?[1-9][\d]{0,15}$/;
+        if (!phoneRegex.test(phone.replace(/\s/g, ''))) {
+            showError('Please enter a valid phone number.');
+            return;
+        }
+        
+        // Show success message
+        showSuccess();
+        
+        // Reset form
+        this.reset();
+    });
+    
+    // Form field animations
+    const formFields = document.querySelectorAll('.form-control');
+    formFields.forEach(field => {
+        field.addEventListener('focus', function() {
+            this.parentElement.classList.add('focused');
+        });
+        
+        field.addEventListener('blur', function() {
+            this.parentElement.classList.remove('focused');
+        });
+    });
+    
+    // Helper functions for alerts
+    function showSuccess() {
+        const successAlert = document.getElementById('successAlert');
+        successAlert.style.display = 'block';
+        successAlert.classList.add('show');
+        
+        // Auto-hide after 5 seconds
+        setTimeout(() => {
+            hideAlerts();
+        }, 5000);
+    }
+    
+    function showError(message) {
+        const errorAlert = document.getElementById('errorAlert');
+        const errorMessageSpan = document.getElementById('errorMessage');
+        errorMessageSpan.textContent = message;
+        errorAlert.style.display = 'block';
+        errorAlert.classList.add('show');
+        
+        // Auto-hide after 5 seconds
+        setTimeout(() => {
+            hideAlerts();
+        }, 5000);
+    }
+    
+    function hideAlerts() {
+        const successAlert = document.getElementById('successAlert');
+        const errorAlert = document.getElementById('errorAlert');
+        
+        successAlert.style.display = 'none';
+        errorAlert.style.display = 'none';
+        successAlert.classList.remove('show');
+        errorAlert.classList.remove('show');
+    }
+});
@@ -0,0 +1,32 @@
+function showReviewModal(vehicleId) {
+    const modal = new bootstrap.Modal(document.getElementById('reviewModal'));
+    const form = document.getElementById('reviewForm');
+    form.action = `/add_review/${vehicleId}/`;
+    modal.show();
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Add hover effects to booking rows
+    const bookingRows = document.querySelectorAll('.booking-row');
+    bookingRows.forEach(row => {
+        row.addEventListener('mouseenter', function() {
+            this.style.backgroundColor = '#f8f9fa';
+        });
+        
+        row.addEventListener('mouseleave', function() {
+            this.style.backgroundColor = '';
+        });
+    });
+    
+    // Form validation for review modal
+    const reviewForm = document.getElementById('reviewForm');
+    reviewForm.addEventListener('submit', function(event) {
+        const rating = document.getElementById('rating').value;
+        const comment = document.getElementById('comment').value;
+        
+        if (!rating || !comment.trim()) {
+            event.preventDefault();
+            alert('Please fill in all required fields.');
+        }
+    });
+});
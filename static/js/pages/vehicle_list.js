@@ -0,0 +1,55 @@
+// Ask the server for "total for your dates" on every card when the dates change
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('.vehicle-search-form');
+    const start = form && form.elements.start;
+    const end = form && form.elements.end;
+    const cards = document.querySelectorAll('.vehicle-card[data-vehicle-id]');
+    if (!start || !end || !cards.length) return;
+    
+    function refreshQuotes() {
+        if (!start.value || !end.value) return;
+        const ids = Array.from(cards, card => card.dataset.vehicleId).join(',');
+        const params = new URLSearchParams({start: start.value, end: end.value, ids: ids});
+        fetch(form.dataset.quotesUrl + '?' + params.toString())
+            .then(response => response.ok ? response.json() : null)
+            .then(data => {
+                if (!data) return;
+                cards.forEach(card => {
+                    const quote = data.quotes[card.dataset.vehicleId];
+                    const box = card.querySelector('.vehicle-quote');
+                    if (!quote || !box) return;
+                    box.querySelector('.quote-period').textContent = data.period;
+                    box.querySelector('.quote-total').textContent = '₹' + quote.total;
+                    box.classList.remove('d-none');
+                });
+            });
+    }
+    start.addEventListener('change', refreshQuotes);
+    end.addEventListener('change', refreshQuotes);
+});
+
+// Refresh facet counts as filters change, before the form is submitted
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('.vehicle-search-form');
+    const facets = document.querySelector('.search-facets');
+    if (!form || !facets) return;
+    
+    let pending = null;
+    form.addEventListener('change', function() {
+        clearTimeout(pending);
+        pending = setTimeout(function() {
+            const params = new URLSearchParams(new FormData(form));
+            fetch(facets.dataset.facetsUrl + '?' + params.toString())
+                .then(response => response.json())
+                .then(data => {
+                    facets.querySelectorAll('[data-facet]').forEach(list => {
+                        const counts = {};
+                        (data.facets[list.dataset.facet] || []).forEach(f => { counts[String(f.value)] = f.count; });
+                        list.querySelectorAll('[data-facet-value]').forEach(badge => {
+                            badge.textContent = counts[badge.dataset.facetValue] || 0;
+                        });
+                    });
+                });
+        }, 250);
+    });
+});
@@ -0,0 +1,69 @@
+function goToPage() {
+    const input = document.getElementById('pageJumpInput');
+    const pageNum = parseInt(input.value);
+    const maxPage = parseInt(input.max);
+    
+    if (pageNum && pageNum >= 1 && pageNum <= maxPage) {
+        const currentUrl = new URL(window.location);
+        currentUrl.searchParams.set('page', pageNum);
+        window.location.href = currentUrl.toString();
+    } else {
+        alert(`Please enter a valid page number between 1 and ${maxPage}`);
+        input.focus();
+    }
+}
+
+// Add loading state to pagination
+document.addEventListener('DOMContentLoaded', function() {
+    const pagination = document.querySelector('.pagination');
+    const pageLinks = document.querySelectorAll('.pagination .page-link:not(.page-link-current)');
+    
+    pageLinks.forEach(link => {
+        link.addEventListener('click', function() {
+            if (!this.parentElement.classList.contains('disabled')) {
+                pagination.classList.add('loading');
+                
+                // Remove loading state after navigation
+                setTimeout(() => {
+                    pagination.classList.remove('loading');
+                }, 1000);
+            }
+        });
+    });
+    
+    // Enter key support for page jump
+    const pageJumpInput = document.getElementById('pageJumpInput');
+    if (pageJumpInput) {
+        pageJumpInput.addEventListener('keypress', function(e) {
+            if (e.key === 'Enter') {
+                goToPage();
+            }
+        });
+        document.getElementById('pageJumpButton').addEventListener('click', goToPage);
+    }
+    
+    // Add smooth scrolling to top when changing pages
+    pageLinks.forEach(link => {
+        link.addEventListener('click', function() {
+            if (!this.parentElement.classList.contains('disabled')) {
+                window.scrollTo({
+                    top: 0,
+                    behavior: 'smooth'
+                });
+            }
+        });
+    });
+    
+    // Enhanced hover effects for mobile
+    if ('ontouchstart' in window) {
+        pageLinks.forEach(link => {
+            link.addEventListener('touchstart', function() {
+                this.style.transform = 'scale(0.95)';
+            });
+            
+            link.addEventListener('touchend', function() {
+                this.style.transform = '';
+            });
+        });
+    }
+});
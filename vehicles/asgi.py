@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vehicles.settings')
+# Serve the async versions of the read-heavy views. Each ASGI request runs
+# in its own context, so connections can't be reused between requests:
+# don't keep them open (use DB_POOL_SIZE on PostgreSQL instead)
+os.environ.setdefault('ASYNC_VIEWS', '1')
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,51 @@
+"""
+CACHES entries from URLs, so deployments configure the cache through the
+environment:
+
+    locmem://                               (this process only, the default)
+    redis://host:6379/0                     (rediss:// for TLS)
+    memcached://host1:11211,host2:11211
+    dummy://                                (caches nothing)
+
+Query parameters become backend OPTIONS. Several aliases can share one
+server; ``prefix`` keeps their keys apart.
+"""
+from urllib.parse import parse_qsl, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+PROCESS_LOCAL = {'locmem'}
+
+
+def is_shared(url):
+    """Whether every worker process sees the same entries"""
+    return urlsplit(url).scheme not in PROCESS_LOCAL
+
+
+def cache_config(url, prefix, max_entries=None):
+    """
+    One CACHES entry under ``prefix``. ``max_entries`` bounds a process-local
+    cache; shared servers evict by their own memory limits.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in BACKENDS:
+        raise ImproperlyConfigured(f'Unsupported cache URL scheme {parts.scheme!r} in {url!r}')
+    config = {'BACKEND': BACKENDS[parts.scheme], 'OPTIONS': dict(parse_qsl(parts.query))}
+    if parts.scheme == 'locmem':
+        config['LOCATION'] = f'{parts.netloc or "rental-house"}-{prefix}'
+        if max_entries:
+            config['OPTIONS']['MAX_ENTRIES'] = max_entries
+    elif parts.scheme == 'memcached':
+        config['LOCATION'] = parts.netloc.split(',')
+        config['KEY_PREFIX'] = prefix
+    elif parts.scheme != 'dummy':
+        config['LOCATION'] = parts._replace(query='').geturl()
+        config['KEY_PREFIX'] = prefix
+    return config
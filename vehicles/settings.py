@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .cache import cache_config, is_shared
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,7 +45,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'myapp.metrics.MetricsMiddleware',
+    'myapp.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'myapp.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -50,18 +57,28 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'vehicles.urls'
+# vehicles/asgi.py sets ASYNC_VIEWS=1 to serve the async read-heavy views
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '') == '1'
+ROOT_URLCONF = 'vehicles.asgi_urls' if ASYNC_VIEWS else 'vehicles.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'myapp.context_processors.fragment_caching',
+            ],
+            # Compile each template once per process. runserver's autoreloader
+            # still clears it when a template changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -73,13 +90,107 @@ WSGI_APPLICATION = 'vehicles.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_URL is the primary, DATABASE_REPLICA_URLS a comma-separated list
+# of read replicas (see vehicles/database.py for the URL format). Locally a
+# second SQLite file can act as the replica; refresh it with
+# "manage.py sync_sqlite_replica". DB_POOL_SIZE enables psycopg's pool on
+# PostgreSQL, otherwise connections persist for DB_CONN_MAX_AGE seconds.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0))
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(
+        os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'), BASE_DIR, DB_CONN_MAX_AGE, DB_POOL_SIZE,
+    ),
+}
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(',')), 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = database_config(url.strip(), BASE_DIR, DB_CONN_MAX_AGE, DB_POOL_SIZE)
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+# SQLITE_PRODUCTION=1 turns on the tuned SQLite profile (myapp/sqlite.py):
+# WAL, synchronous=NORMAL, mmap, a larger page cache, a busy timeout, and
+# BEGIN IMMEDIATE for transactions
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION', '') == '1'
+if SQLITE_PRODUCTION:
+    for config in DATABASES.values():
+        if config['ENGINE'] == 'django.db.backends.sqlite3':
+            config['OPTIONS'].setdefault('transaction_mode', 'IMMEDIATE')
+
+# Read-only views read from a replica; any write pins the client to the
+# primary for REPLICA_PIN_SECONDS, which should exceed the replication lag
+DATABASE_ROUTERS = ['myapp.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# CACHE_URL points every alias at one backend (see vehicles/cache.py), each
+# under its own key prefix. The catalog, facets, booking counters and cards
+# are invalidated by signals in the process that made the change, so with
+# more than one worker process CACHE_URL must name a shared cache (Redis or
+# Memcached); the process-local default only suits a single process.
+CACHE_URL = os.environ.get('CACHE_URL', 'locmem://')
+SESSION_CACHE_URL = os.environ.get('SESSION_CACHE_URL', CACHE_URL)
+CACHES = {
+    'default': cache_config(CACHE_URL, 'default'),
+    # Kept apart so culling catalog entries never logs anyone out
+    'sessions': cache_config(SESSION_CACHE_URL, 'sessions', max_entries=10000),
+    # Rendered vehicle cards; keys include updated_at, so stale entries are
+    # never read and simply get culled
+    'template_fragments': cache_config(CACHE_URL, 'fragments', max_entries=5000),
 }
 
+# Sessions: SESSION_BACKEND=signed_cookies keeps them entirely client side
+# (no storage at all, but they can't be revoked server-side), "cache" keeps
+# them only in the sessions cache, and "cached_db" reads through that cache
+# and writes through to the database. Both cache engines need
+# SESSION_CACHE_URL (or CACHE_URL) to name a cache shared by all workers,
+# or a logout on one worker leaves the session valid on the others, so
+# without one the default is the plain database engine.
+# Expired rows are removed in batches by "manage.py purge_sessions".
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cached_db' if is_shared(SESSION_CACHE_URL) else 'db')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Flash messages travel in a signed cookie instead of the session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Home page context is invalidated by signals, the timeout is only a safety net
+HOME_CACHE_TIMEOUT = 60 * 60
+
+# Per-user booking counters, kept fresh by booking signals; set to 0 to disable
+BOOKING_STATS_CACHE_TIMEOUT = 60 * 60
+
+# Rendered vehicle cards, keyed by vehicle id and updated_at; set to 0 to
+# disable
+VEHICLE_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Bookings that ended this many days ago are moved to the archive table by
+# "manage.py archive_bookings"
+BOOKING_ARCHIVE_AFTER_DAYS = 180
+
+# Vehicle list facet counts per filter combination, invalidated with the
+# home page; set to 0 to disable
+FACET_CACHE_TIMEOUT = 10 * 60
+
+# Request metrics served at /metrics/. With several worker processes, point
+# METRICS_DIR at a directory shared by them (and emptied on deploy) so every
+# worker reports the totals of all of them. METRICS_TOKEN, when set, must be
+# sent as "Authorization: Bearer <token>".
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -121,6 +232,21 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic writes content-hashed, precompressed copies that
+# myapp.staticfiles.StaticFilesMiddleware serves with far-future caching.
+# Off by default in development (and so in tests), where there is no
+# collected manifest for {% static %} to look hashed names up in.
+STATIC_MANIFEST = os.environ.get('STATIC_MANIFEST', '' if DEBUG else '1') == '1'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': (
+            'myapp.staticfiles.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'